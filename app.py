@@ -1,24 +1,52 @@
-from flask import Flask, render_template, jsonify, request, session
+from flask import Flask, render_template, request, session, send_file
 import random
-import math
 import time
 import json
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
 from dataclasses import dataclass, asdict
 from typing import List, Any, Optional, Tuple
 import base64
+import hashlib
 from io import BytesIO
 from PIL import Image, ImageDraw
+import numpy as np
 import secrets
+import threading
+import orjson
 
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(16)
 
-def clamp_color(value):
-    """Ensure color values are within valid range (0-255)."""
-    return max(0, min(255, int(value)))
+# Levels with flat color regions, encoded losslessly as PNG
+PNG_IMAGE_TYPES = {"cat", "abstract"}
+
+# Petal directions shared by every sunflower
+PETAL_ANGLES = np.radians(np.arange(0, 360, 45))
+PETAL_COS = np.cos(PETAL_ANGLES).tolist()
+PETAL_SIN = np.sin(PETAL_ANGLES).tolist()
+
+def near_correct(xs, ys, correct_xs, correct_ys, tolerance=30):
+    """Branchless snap test; works on scalars or whole piece arrays."""
+    return (abs(xs - correct_xs) < tolerance) & (abs(ys - correct_ys) < tolerance)
+
+# Client coordinates beyond this are rejected; it leaves int32 headroom for
+# the snap test's subtraction, and NaN and infinities fail the comparison
+COORDINATE_LIMIT = 2 ** 30
+
+def is_coordinate(value):
+    """True for an int or float from client JSON that fits the position arrays."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    return -COORDINATE_LIMIT < value < COORDINATE_LIMIT
+
+def vertical_gradient(red, green, blue, width=600):
+    """Build an RGB image band with one row per entry of the channel arrays."""
+    rows = np.stack(np.broadcast_arrays(red, green, blue), axis=-1)
+    rows = np.clip(rows, 0, 255).astype(np.uint8)
+    band = np.broadcast_to(rows[:, None, :], (rows.shape[0], width, 3))
+    return Image.fromarray(np.ascontiguousarray(band))
 
 class HintType(Enum):
     """Types of hints available in the enhanced hint system."""
@@ -39,6 +67,14 @@ class PuzzleLevel:
     grid_size: tuple
     points: int
 
+@dataclass
+class RenderedLevel:
+    """Encoded images for a level, shared by every game instance."""
+    original_image_base64: str  # 200x150 preview
+    atlas: bytes
+    atlas_mimetype: str
+    atlas_etag: str
+
 @dataclass
 class PuzzleRegion:
     """Represents a rectangular region within the puzzle."""
@@ -54,29 +90,69 @@ class PuzzleRegion:
                 self.y <= py <= self.y + self.height)
 
 class PuzzlePiece:
-    def __init__(self, x, y, width, height, image_section, correct_x, correct_y, piece_id):
-        self.x = x
-        self.y = y
+    """A puzzle piece whose position and placement live in the game's piece arrays."""
+
+    def __init__(self, game, piece_id, width, height):
+        self.game = game
+        self.piece_id = piece_id
         self.width = width
         self.height = height
-        self.image_section = image_section  # Will be base64 encoded image data
-        self.correct_x = correct_x
-        self.correct_y = correct_y
-        self.piece_id = piece_id
-        self.is_placed = False
         self.dragging = False
         self.hint_revealed = False
         self.rotation = 0
 
+    @property
+    def x(self):
+        return int(self.game.piece_xs[self.piece_id])
+
+    @x.setter
+    def x(self, value):
+        self.game.piece_xs[self.piece_id] = value
+
+    @property
+    def y(self):
+        return int(self.game.piece_ys[self.piece_id])
+
+    @y.setter
+    def y(self, value):
+        self.game.piece_ys[self.piece_id] = value
+
+    @property
+    def correct_x(self):
+        return int(self.game.correct_xs[self.piece_id])
+
+    @property
+    def correct_y(self):
+        return int(self.game.correct_ys[self.piece_id])
+
+    @property
+    def sx(self):
+        """Horizontal offset of this piece within the level atlas."""
+        return self.correct_x - self.game.puzzle_x
+
+    @property
+    def sy(self):
+        """Vertical offset of this piece within the level atlas."""
+        return self.correct_y - self.game.puzzle_y
+
+    @property
+    def is_placed(self):
+        return bool(self.game.placed[self.piece_id])
+
+    @is_placed.setter
+    def is_placed(self, value):
+        self.game.placed[self.piece_id] = value
+
     def to_dict(self):
         return {
             'x': self.x,
             'y': self.y,
             'width': self.width,
             'height': self.height,
-            'image_section': self.image_section,
             'correct_x': self.correct_x,
             'correct_y': self.correct_y,
+            'sx': self.sx,
+            'sy': self.sy,
             'piece_id': self.piece_id,
             'is_placed': self.is_placed,
             'dragging': self.dragging,
@@ -84,15 +160,32 @@ class PuzzlePiece:
             'rotation': self.rotation
         }
 
+    def to_state_dict(self):
+        """The fields that change while a level is played."""
+        return {
+            'piece_id': self.piece_id,
+            'x': self.x,
+            'y': self.y,
+            'is_placed': self.is_placed,
+            'hint_revealed': self.hint_revealed
+        }
+
     def contains_point(self, px, py):
         return (self.x <= px <= self.x + self.width and
                 self.y <= py <= self.y + self.height)
 
     def is_near_correct_position(self, tolerance=30):
-        return (abs(self.x - self.correct_x) < tolerance and
-                abs(self.y - self.correct_y) < tolerance)
+        return near_correct(self.x, self.y, self.correct_x, self.correct_y, tolerance)
 
 class JigsawPuzzleGame:
+    # Rendered levels shared by every game instance, keyed by image_url
+    _level_cache = {}
+    _render_lock = threading.Lock()
+    _cache_warmer = None
+
+    # Hints are available every 2 hours
+    _HINT_COOLDOWN_S = 7200.0
+
     def __init__(self):
         self.screen_width = 1200
         self.screen_height = 800
@@ -113,16 +206,35 @@ class JigsawPuzzleGame:
         self.pieces_area_x = 700
         self.pieces_area_y = 100
 
-        # Initialize levels
+        # Layout never changes, so build its game-state dicts once
+        self._puzzle_dimensions = {
+            'width': self.puzzle_width,
+            'height': self.puzzle_height,
+            'x': self.puzzle_x,
+            'y': self.puzzle_y
+        }
+        self._pieces_area = {
+            'x': self.pieces_area_x,
+            'y': self.pieces_area_y
+        }
+
+        # Initialize levels and render them all in the background
         self.levels = self.create_levels()
+        self._level_dicts = [asdict(level) for level in self.levels]
+        if JigsawPuzzleGame._cache_warmer is None:
+            JigsawPuzzleGame._cache_warmer = threading.Thread(target=self._warm_cache, daemon=True)
+            JigsawPuzzleGame._cache_warmer.start()
 
         # Game variables
         self.pieces = []
         self.selected_piece = None
 
-        # Hint system
+        # Hint system (per-player values are restored from the session by load_progress)
         self.save_file = "puzzle_progress.json"
-        self.load_progress()
+        self.last_hint_time = None  # wall clock, persisted in the session
+        self.last_hint_monotonic = None  # same moment on time.monotonic(), for cooldown checks
+        self._last_hint_iso = None
+        self.hints_used = 0
 
         # Load first level
         self.load_level(self.current_level)
@@ -142,32 +254,32 @@ class JigsawPuzzleGame:
 
     def create_image(self, image_type):
         """Create different types of images using PIL."""
-        img = Image.new('RGB', (600, 450), color=(135, 206, 235))
-        draw = ImageDraw.Draw(img)
+        # Seed from the image type so a level always renders the same picture
+        rng = random.Random(image_type)
 
         if image_type == "cat":
-            return self.create_cat_image_pil(img, draw)
+            return self.create_cat_image_pil(rng)
         elif image_type == "monalisa":
-            return self.create_monalisa_image_pil(img, draw)
+            return self.create_monalisa_image_pil(rng)
         elif image_type == "starry_night":
-            return self.create_starry_night_image_pil(img, draw)
+            return self.create_starry_night_image_pil(rng)
         elif image_type == "sunflower":
-            return self.create_sunflower_image_pil(img, draw)
+            return self.create_sunflower_image_pil(rng)
         elif image_type == "landscape":
-            return self.create_landscape_image_pil(img, draw)
+            return self.create_landscape_image_pil(rng)
         elif image_type == "abstract":
-            return self.create_abstract_image_pil(img, draw)
+            return self.create_abstract_image_pil(rng)
         elif image_type == "city":
-            return self.create_city_image_pil(img, draw)
+            return self.create_city_image_pil(rng)
         elif image_type == "ocean":
-            return self.create_ocean_image_pil(img, draw)
+            return self.create_ocean_image_pil(rng)
 
-        return img
+        return Image.new('RGB', (600, 450), color=(135, 206, 235))
 
-    def create_cat_image_pil(self, img, draw):
+    def create_cat_image_pil(self, rng):
         """Create a stylized cat image using PIL."""
-        # Background
-        draw.rectangle([0, 0, 600, 450], fill=(135, 206, 235))
+        img = Image.new('RGB', (600, 450), color=(135, 206, 235))
+        draw = ImageDraw.Draw(img)
 
         # Cat body (orange)
         draw.ellipse([200, 200, 400, 350], fill=(255, 140, 0))
@@ -193,21 +305,24 @@ class JigsawPuzzleGame:
             y = 150 + i * 20
             draw.line([(250, y), (350, y)], fill=(200, 100, 0), width=3)
 
-        # Grass
-        for x in range(0, 600, 20):
-            for blade in range(3):
-                blade_x = x + random.randint(0, 15)
-                draw.line([(blade_x, 400), (blade_x, 380 + random.randint(0, 20))],
-                         fill=(34, 139, 34), width=2)
+        # Grass - three blades per 20px column, offsets drawn in one batch
+        np_rng = np.random.default_rng(rng.getrandbits(32))
+        blade_xs = np.arange(0, 600, 20)[:, None] + np_rng.integers(0, 16, (30, 3))
+        blade_tops = 380 + np_rng.integers(0, 21, (30, 3))
+        for blade_x, blade_top in zip(blade_xs.ravel().tolist(), blade_tops.ravel().tolist()):
+            draw.line([(blade_x, 400), (blade_x, blade_top)], fill=(34, 139, 34), width=2)
 
         return img
 
-    def create_monalisa_image_pil(self, img, draw):
+    def create_monalisa_image_pil(self, rng):
         """Create a simplified Mona Lisa inspired image."""
+        img = Image.new('RGB', (600, 450))
+        draw = ImageDraw.Draw(img)
+
         # Background gradient effect
-        for y in range(450):
-            color_val = clamp_color(100 + 50 * (y / 450))
-            draw.rectangle([0, y, 600, y+1], fill=(color_val, clamp_color(color_val - 20), clamp_color(color_val - 30)))
+        ys = np.arange(450)
+        color_val = np.clip((100 + 50 * (ys / 450)).astype(int), 0, 255)
+        img.paste(vertical_gradient(color_val, color_val - 20, color_val - 30), (0, 0))
 
         # Face
         draw.ellipse([200, 120, 400, 370], fill=(245, 220, 177))
@@ -230,20 +345,20 @@ class JigsawPuzzleGame:
 
         return img
 
-    def create_starry_night_image_pil(self, img, draw):
+    def create_starry_night_image_pil(self, rng):
         """Create a Van Gogh Starry Night inspired image."""
-        # Night sky
-        for y in range(300):
-            blue_val = clamp_color(25 + 30 * math.sin(y / 20))
-            draw.rectangle([0, y, 600, y+1], fill=(blue_val, clamp_color(blue_val + 10), clamp_color(blue_val + 40)))
+        img = Image.new('RGB', (600, 450), color=(40, 40, 80))
+        draw = ImageDraw.Draw(img)
 
-        # Ground
-        draw.rectangle([0, 300, 600, 450], fill=(40, 40, 80))
+        # Night sky
+        ys = np.arange(300)
+        blue_val = np.clip((25 + 30 * np.sin(ys / 20.0)).astype(int), 0, 255)
+        img.paste(vertical_gradient(blue_val, blue_val + 10, blue_val + 40), (0, 0))
 
         # Stars
         for i in range(30):
-            x = random.randint(0, 600)
-            y = random.randint(0, 250)
+            x = rng.randint(0, 600)
+            y = rng.randint(0, 250)
             draw.ellipse([x-3, y-3, x+3, y+3], fill=(255, 255, 200))
 
         # Moon
@@ -260,10 +375,10 @@ class JigsawPuzzleGame:
 
         return img
 
-    def create_sunflower_image_pil(self, img, draw):
+    def create_sunflower_image_pil(self, rng):
         """Create a sunflower field image."""
-        # Sky
-        draw.rectangle([0, 0, 600, 350], fill=(135, 206, 235))
+        img = Image.new('RGB', (600, 450), color=(135, 206, 235))
+        draw = ImageDraw.Draw(img)
 
         # Ground
         draw.rectangle([0, 350, 600, 450], fill=(34, 139, 34))
@@ -272,12 +387,12 @@ class JigsawPuzzleGame:
         sunflower_positions = [(150, 250), (350, 200), (500, 280), (80, 300), (420, 320)]
 
         for x, y in sunflower_positions:
-            size = random.randint(40, 70)
+            size = rng.randint(40, 70)
 
             # Petals (simplified as circles around center)
-            for angle in range(0, 360, 45):
-                petal_x = x + math.cos(math.radians(angle)) * size
-                petal_y = y + math.sin(math.radians(angle)) * size
+            for cos_a, sin_a in zip(PETAL_COS, PETAL_SIN):
+                petal_x = x + cos_a * size
+                petal_y = y + sin_a * size
                 draw.ellipse([petal_x-15, petal_y-8, petal_x+15, petal_y+8], fill=(255, 215, 0))
 
             # Center
@@ -289,19 +404,22 @@ class JigsawPuzzleGame:
         # Clouds
         for i in range(3):
             cloud_x = 100 + i * 200
-            cloud_y = 50 + random.randint(0, 30)
+            cloud_y = 50 + rng.randint(0, 30)
             draw.ellipse([cloud_x-30, cloud_y-30, cloud_x+30, cloud_y+30], fill=(255, 255, 255))
             draw.ellipse([cloud_x-5, cloud_y-35, cloud_x+55, cloud_y+35], fill=(255, 255, 255))
             draw.ellipse([cloud_x+20, cloud_y-30, cloud_x+80, cloud_y+30], fill=(255, 255, 255))
 
         return img
 
-    def create_landscape_image_pil(self, img, draw):
+    def create_landscape_image_pil(self, rng):
         """Create a mountain lake landscape."""
+        img = Image.new('RGB', (600, 450), color=(135, 206, 235))
+        draw = ImageDraw.Draw(img)
+
         # Sky gradient
-        for y in range(200):
-            blue = clamp_color(135 + 100 * (1 - y / 200))
-            draw.rectangle([0, y, 600, y+1], fill=(blue, clamp_color(blue + 50), 255))
+        ys = np.arange(200)
+        blue = np.clip((135 + 100 * (1 - ys / 200)).astype(int), 0, 255)
+        img.paste(vertical_gradient(blue, blue + 50, 255), (0, 0))
 
         # Mountains
         draw.polygon([(0, 200), (150, 80), (300, 120), (450, 60), (600, 180), (600, 200)], fill=(100, 100, 100))
@@ -316,54 +434,65 @@ class JigsawPuzzleGame:
         # Trees
         for i in range(8):
             x = 80 + i * 60
-            height = random.randint(40, 80)
+            height = rng.randint(40, 80)
             draw.rectangle([x, 200 - height, x + 10, 200], fill=(139, 69, 19))
             draw.ellipse([x-10, 200 - height - 15, x + 20, 200 - height + 15], fill=(34, 139, 34))
 
         return img
 
-    def create_abstract_image_pil(self, img, draw):
+    def create_abstract_image_pil(self, rng):
         """Create a colorful abstract art image."""
-        draw.rectangle([0, 0, 600, 450], fill=(240, 240, 240))
+        img = Image.new('RGB', (600, 450), color=(240, 240, 240))
+        draw = ImageDraw.Draw(img)
 
         colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0),
                  (255, 0, 255), (0, 255, 255), (255, 165, 0), (128, 0, 128)]
 
-        # Geometric shapes
-        for i in range(15):
-            color = random.choice(colors)
-            shape_type = random.randint(1, 4)
-            x = random.randint(0, 500)
-            y = random.randint(0, 350)
+        # Geometric shapes - every shape's parameters drawn in one batch
+        count = 15
+        np_rng = np.random.default_rng(rng.getrandbits(32))
+        color_ids = np_rng.integers(0, len(colors), count).tolist()
+        shape_types = np_rng.integers(1, 5, count).tolist()
+        xs = np_rng.integers(0, 501, count).tolist()
+        ys = np_rng.integers(0, 351, count).tolist()
+        radii = np_rng.integers(20, 81, count).tolist()
+        sizes = np_rng.integers(30, 101, (count, 2)).tolist()
+        corners = np_rng.integers(20, 81, (count, 4)).tolist()
+        line_ends = np_rng.integers(-100, 101, (count, 2)).tolist()
+
+        for i in range(count):
+            color = colors[color_ids[i]]
+            shape_type = shape_types[i]
+            x = xs[i]
+            y = ys[i]
 
             if shape_type == 1:  # Circle
-                radius = random.randint(20, 80)
+                radius = radii[i]
                 draw.ellipse([x-radius, y-radius, x+radius, y+radius], fill=color)
             elif shape_type == 2:  # Rectangle
-                w = random.randint(30, 100)
-                h = random.randint(30, 100)
+                w, h = sizes[i]
                 draw.rectangle([x, y, x+w, y+h], fill=color)
             elif shape_type == 3:  # Triangle
-                points = [(x, y), (x + random.randint(20, 80), y + random.randint(20, 80)),
-                         (x - random.randint(20, 80), y + random.randint(20, 80))]
+                dx1, dy1, dx2, dy2 = corners[i]
+                points = [(x, y), (x + dx1, y + dy1), (x - dx2, y + dy2)]
                 draw.polygon(points, fill=color)
             else:  # Lines
-                end_x = x + random.randint(-100, 100)
-                end_y = y + random.randint(-100, 100)
+                end_x = x + line_ends[i][0]
+                end_y = y + line_ends[i][1]
                 draw.line([(x, y), (end_x, end_y)], fill=color, width=5)
 
         return img
 
-    def create_city_image_pil(self, img, draw):
+    def create_city_image_pil(self, rng):
         """Create a city skyline image."""
-        # Sky gradient (sunset)
-        for y in range(300):
-            red = clamp_color(255 * (1 - y / 300))
-            blue = clamp_color(100 + 155 * (y / 300))
-            draw.rectangle([0, y, 600, y+1], fill=(red, 100, blue))
+        img = Image.new('RGB', (600, 450), color=(50, 50, 50))
+        draw = ImageDraw.Draw(img)
 
-        # Ground
-        draw.rectangle([0, 300, 600, 450], fill=(50, 50, 50))
+        # Sky gradient (sunset)
+        ys = np.arange(300)
+        red = (255 * (1 - ys / 300)).astype(int)
+        blue = (100 + 155 * (ys / 300)).astype(int)
+        img.paste(vertical_gradient(red, 100, blue), (0, 0))
 
         # Buildings
         building_heights = [180, 220, 160, 200, 240, 190, 170, 210]
@@ -381,7 +510,7 @@ class JigsawPuzzleGame:
                 for col in range(building_width // 20):
                     window_x = x + 5 + col * 20
                     window_y = y + 10 + row * 25
-                    if random.random() > 0.3:  # Some windows are lit
+                    if rng.random() > 0.3:  # Some windows are lit
                         draw.rectangle([window_x, window_y, window_x + 10, window_y + 15], fill=(255, 255, 100))
                     else:
                         draw.rectangle([window_x, window_y, window_x + 10, window_y + 15], fill=(30, 30, 30))
@@ -391,10 +520,10 @@ class JigsawPuzzleGame:
 
         return img
 
-    def create_ocean_image_pil(self, img, draw):
+    def create_ocean_image_pil(self, rng):
         """Create an ocean waves image."""
-        # Sky
-        draw.rectangle([0, 0, 600, 150], fill=(135, 206, 235))
+        img = Image.new('RGB', (600, 450), color=(135, 206, 235))
+        draw = ImageDraw.Draw(img)
 
         # Ocean layers
         ocean_colors = [(0, 100, 150), (0, 120, 170), (0, 140, 190), (0, 160, 210)]
@@ -406,19 +535,33 @@ class JigsawPuzzleGame:
         # Clouds
         for i in range(4):
             x = 50 + i * 140
-            y = 30 + random.randint(0, 40)
+            y = 30 + rng.randint(0, 40)
             for j in range(3):
-                draw.ellipse([x + j * 20 - 15, y + random.randint(-10, 10) - 15,
-                            x + j * 20 + 15, y + random.randint(-10, 10) + 15], fill=(255, 255, 255))
+                draw.ellipse([x + j * 20 - 15, y + rng.randint(-10, 10) - 15,
+                            x + j * 20 + 15, y + rng.randint(-10, 10) + 15], fill=(255, 255, 255))
 
         return img
 
-    def image_to_base64(self, pil_image):
-        """Convert PIL image to base64 string."""
+    def save_image(self, pil_image, image_format="PNG"):
+        """Encode PIL image as PNG or WebP into a new buffer."""
         buffered = BytesIO()
-        pil_image.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
-        return f"data:image/png;base64,{img_str}"
+        if image_format == "WEBP":
+            # Fastest WebP preset; far cheaper than deflate for painted scenes
+            pil_image.save(buffered, format="WEBP", quality=80, method=0)
+        else:
+            # Lowest deflate effort: still lossless, just a slightly larger payload
+            pil_image.save(buffered, format="PNG", compress_level=1)
+        return buffered
+
+    def image_to_bytes(self, pil_image, image_format="PNG"):
+        """Encode PIL image as PNG or WebP bytes."""
+        return self.save_image(pil_image, image_format).getvalue()
+
+    def image_to_base64(self, pil_image, image_format="PNG"):
+        """Convert PIL image to base64 string."""
+        buffered = self.save_image(pil_image, image_format)
+        img_str = base64.b64encode(buffered.getbuffer()).decode('ascii')
+        return f"data:image/{image_format.lower()};base64,{img_str}"
 
     def load_level(self, level_index):
         """Load a specific puzzle level."""
@@ -430,64 +573,111 @@ class JigsawPuzzleGame:
         self.piece_width = self.puzzle_width // self.grid_cols
         self.piece_height = self.puzzle_height // self.grid_rows
 
-        # Generate the image
-        pil_image = self.create_image(level.image_url)
-        pil_image = pil_image.resize((self.puzzle_width, self.puzzle_height))
-        self.original_image_base64 = self.image_to_base64(pil_image)
+        rendered = self.render_level(level)
+        self.original_image_base64 = rendered.original_image_base64
+        # The etag in the URL lets clients cache the atlas indefinitely
+        self.atlas_url = f"/api/atlas/{level_index}?v={rendered.atlas_etag}"
 
         self.pieces = []
         self.puzzle_complete = False
         self.level_start_time = time.time()
 
-        self.create_pieces(pil_image)
+        self.create_pieces()
         self.scramble_pieces()
         return True
 
-    def create_pieces(self, pil_image):
-        """Create puzzle pieces from the current image."""
-        piece_id = 0
-        for row in range(self.grid_rows):
-            for col in range(self.grid_cols):
-                # Extract piece from original image
-                left = col * self.piece_width
-                top = row * self.piece_height
-                right = left + self.piece_width
-                bottom = top + self.piece_height
-
-                piece_image = pil_image.crop((left, top, right, bottom))
-                piece_base64 = self.image_to_base64(piece_image)
-
-                # Correct position in puzzle
-                correct_x = self.puzzle_x + col * self.piece_width
-                correct_y = self.puzzle_y + row * self.piece_height
-
-                # Create piece
-                piece = PuzzlePiece(0, 0, self.piece_width, self.piece_height,
-                                  piece_base64, correct_x, correct_y, piece_id)
-                self.pieces.append(piece)
-                piece_id += 1
+    def render_level(self, level):
+        """Render a level's image once and return its cached encodings."""
+        # Levels render deterministically, so the encoded images can be reused
+        rendered = self._level_cache.get(level.image_url)
+        if rendered is not None:
+            return rendered
+
+        with self._render_lock:
+            rendered = self._level_cache.get(level.image_url)
+            if rendered is not None:
+                return rendered
+
+            pil_image = self.create_image(level.image_url)
+            if pil_image.size != (self.puzzle_width, self.puzzle_height):
+                pil_image = pil_image.resize((self.puzzle_width, self.puzzle_height))
+            # Flat-color art keeps PNG's sharp edges; painted scenes use WebP
+            image_format = "PNG" if level.image_url in PNG_IMAGE_TYPES else "WEBP"
+            atlas = self.image_to_bytes(pil_image, image_format)
+            # The UI only needs a small preview; the full image is the atlas
+            thumbnail = pil_image.resize((200, 150), Image.BILINEAR)
+            rendered = RenderedLevel(self.image_to_base64(thumbnail, image_format), atlas,
+                                     f"image/{image_format.lower()}", hashlib.sha1(atlas).hexdigest())
+            self._level_cache[level.image_url] = rendered
+            return rendered
+
+    def _warm_cache(self):
+        """Render every level up front so later level loads are cache hits."""
+        for level in self.levels:
+            self.render_level(level)
+
+    def create_pieces(self):
+        """Create puzzle pieces over the level atlas."""
+        count = self.grid_cols * self.grid_rows
+        ids = np.arange(count)
+
+        # Piece state is kept as parallel arrays indexed by piece_id
+        self.piece_xs = np.zeros(count, dtype=np.int32)
+        self.piece_ys = np.zeros(count, dtype=np.int32)
+        self.correct_xs = (self.puzzle_x + (ids % self.grid_cols) * self.piece_width).astype(np.int32)
+        self.correct_ys = (self.puzzle_y + (ids // self.grid_cols) * self.piece_height).astype(np.int32)
+        self.placed = np.zeros(count, dtype=bool)
+
+        self.pieces = [PuzzlePiece(self, piece_id, self.piece_width, self.piece_height)
+                       for piece_id in range(count)]
+
+    def move_piece(self, piece_id, x, y, tolerance=30):
+        """Move a piece, snapping it into place when near its correct position.
+
+        Returns True if the piece was placed by this move. Raises ValueError
+        when piece_id is not an int or x, y are not usable coordinates.
+        """
+        if isinstance(piece_id, bool) or not isinstance(piece_id, int):
+            raise ValueError(f"Invalid piece id: {piece_id!r}")
+        if not (is_coordinate(x) and is_coordinate(y)):
+            raise ValueError(f"Invalid coordinates: {x!r}, {y!r}")
+        if not 0 <= piece_id < len(self.pieces) or self.placed[piece_id]:
+            return False
+
+        self.piece_xs[piece_id] = int(x)
+        self.piece_ys[piece_id] = int(y)
+        if near_correct(self.piece_xs[piece_id], self.piece_ys[piece_id],
+                        self.correct_xs[piece_id], self.correct_ys[piece_id], tolerance):
+            self.piece_xs[piece_id] = self.correct_xs[piece_id]
+            self.piece_ys[piece_id] = self.correct_ys[piece_id]
+            self.placed[piece_id] = True
+            return True
+        return False
 
     def scramble_pieces(self):
         """Scramble pieces randomly across the pieces area."""
-        available_positions = []
+        rng = np.random.default_rng()
+        count = len(self.pieces)
         cols = 4
-        rows = (len(self.pieces) + cols - 1) // cols
-
-        for row in range(rows + 2):
-            for col in range(cols):
-                x = self.pieces_area_x + col * (self.piece_width + 15) + random.randint(-20, 20)
-                y = self.pieces_area_y + row * (self.piece_height + 15) + random.randint(-10, 10)
-                available_positions.append((x, y))
-
-        random.shuffle(available_positions)
-
-        for i, piece in enumerate(self.pieces):
-            if not piece.is_placed and i < len(available_positions):
-                piece.x, piece.y = available_positions[i]
-                piece.x += random.randint(-30, 30)
-                piece.y += random.randint(-20, 20)
-                piece.x = max(self.pieces_area_x - 50, min(self.screen_width - piece.width, piece.x))
-                piece.y = max(50, min(self.screen_height - piece.height - 100, piece.y))
+        rows = (count + cols - 1) // cols
+
+        # Jittered slots on a loose grid, with extra rows for more scrambling
+        slots = np.arange((rows + 2) * cols)
+        slot_xs = (self.pieces_area_x + (slots % cols) * (self.piece_width + 15)
+                   + rng.integers(-20, 21, slots.size))
+        slot_ys = (self.pieces_area_y + (slots // cols) * (self.piece_height + 15)
+                   + rng.integers(-10, 11, slots.size))
+
+        # Each piece takes a random slot plus some displacement, kept on screen
+        order = rng.permutation(slots.size)[:count]
+        xs = np.clip(slot_xs[order] + rng.integers(-30, 31, count),
+                     self.pieces_area_x - 50, self.screen_width - self.piece_width)
+        ys = np.clip(slot_ys[order] + rng.integers(-20, 21, count),
+                     50, self.screen_height - self.piece_height - 100)
+
+        loose = ~self.placed
+        self.piece_xs[loose] = xs[loose]
+        self.piece_ys[loose] = ys[loose]
 
     def calculate_level_score(self):
         """Calculate score based on time and hints used."""
@@ -519,16 +709,23 @@ class JigsawPuzzleGame:
         return False
 
     def load_progress(self):
-        """Load game progress from session and file."""
-        self.last_hint_time = session.get('last_hint_time')
-        if self.last_hint_time:
-            self.last_hint_time = datetime.fromisoformat(self.last_hint_time)
-        else:
-            self.last_hint_time = None
+        """Restore the requesting player's hints, score and hint time from the session."""
+        last_hint_iso = session.get('last_hint_time')
+        if last_hint_iso != self._last_hint_iso:
+            # Only convert when the session holds a different hint time
+            self._last_hint_iso = last_hint_iso
+            if last_hint_iso:
+                self.last_hint_time = datetime.fromisoformat(last_hint_iso)
+                elapsed = (datetime.now() - self.last_hint_time).total_seconds()
+                self.last_hint_monotonic = time.monotonic() - elapsed
+            else:
+                self.last_hint_time = None
+                self.last_hint_monotonic = None
 
         self.hints_used = session.get('hints_used', 0)
-        self.current_level = session.get('current_level', 0)
         self.total_score = session.get('total_score', 0)
+        # The board and its level are shared by every player; only next_level
+        # and reset_game change it, so a read never re-scrambles the pieces
 
     def save_progress(self):
         """Save game progress to session."""
@@ -536,14 +733,13 @@ class JigsawPuzzleGame:
         session['current_level'] = self.current_level
         session['total_score'] = self.total_score
         if self.last_hint_time:
-            session['last_hint_time'] = self.last_hint_time.isoformat()
+            self._last_hint_iso = self.last_hint_time.isoformat()
+            session['last_hint_time'] = self._last_hint_iso
 
     def can_use_hint(self):
         """Check if hint can be used (every 2 hours)."""
-        if self.last_hint_time is None:
-            return True
-        time_since_last_hint = datetime.now() - self.last_hint_time
-        return time_since_last_hint >= timedelta(hours=2)
+        return (self.last_hint_monotonic is None or
+                time.monotonic() - self.last_hint_monotonic >= self._HINT_COOLDOWN_S)
 
     def use_hint(self):
         """Use a hint to reveal a piece's correct position."""
@@ -556,141 +752,157 @@ class JigsawPuzzleGame:
             piece.hint_revealed = True
             self.hints_used += 1
             self.last_hint_time = datetime.now()
+            self.last_hint_monotonic = time.monotonic()
             self.save_progress()
             return True
         return False
 
+    def get_state_update(self):
+        """Get the parts of the game state that change between moves."""
+        return {
+            'pieces': [piece.to_state_dict() for piece in self.pieces],
+            'current_level': self.current_level,
+            'total_score': self.total_score,
+            'puzzle_complete': self.puzzle_complete,
+            'hints_used': self.hints_used,
+            'can_use_hint': self.can_use_hint()
+        }
+
     def get_game_state(self):
         """Get current game state as dictionary."""
         return {
             'pieces': [piece.to_dict() for piece in self.pieces],
             'current_level': self.current_level,
-            'level_info': asdict(self.levels[self.current_level]),
+            'level_info': self._level_dicts[self.current_level],
             'total_score': self.total_score,
             'puzzle_complete': self.puzzle_complete,
             'hints_used': self.hints_used,
             'can_use_hint': self.can_use_hint(),
             'original_image': self.original_image_base64,
-            'puzzle_dimensions': {
-                'width': self.puzzle_width,
-                'height': self.puzzle_height,
-                'x': self.puzzle_x,
-                'y': self.puzzle_y
-            },
-            'pieces_area': {
-                'x': self.pieces_area_x,
-                'y': self.pieces_area_y
-            }
+            'atlas_url': self.atlas_url,
+            'puzzle_dimensions': self._puzzle_dimensions,
+            'pieces_area': self._pieces_area
         }
 
-# Global game instance
-game = None
+# Global game instance, built once at startup. Every request holds game_lock
+# while it touches the game; load_progress restores the player's session.
+game = JigsawPuzzleGame()
+game_lock = threading.Lock()
+
+def json_response(payload):
+    """Serialize a response with orjson, which copies long base64 strings quickly."""
+    return app.response_class(orjson.dumps(payload), mimetype='application/json')
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+@app.route('/api/game_init')
+def game_init():
+    with game_lock:
+        game.load_progress()
+        return json_response(game.get_game_state())
+
 @app.route('/api/game_state')
 def get_game_state():
-    global game
-    if game is None:
-        game = JigsawPuzzleGame()
-    return jsonify(game.get_game_state())
+    with game_lock:
+        game.load_progress()
+        return json_response(game.get_state_update())
+
+@app.route('/api/atlas/<int:level>')
+def level_atlas(level):
+    if not 0 <= level < len(game.levels):
+        return json_response({'error': 'Unknown level'}), 404
+
+    rendered = game.render_level(game.levels[level])
+    response = send_file(BytesIO(rendered.atlas), mimetype=rendered.atlas_mimetype,
+                         max_age=31536000, etag=rendered.atlas_etag)
+    response.cache_control.immutable = True
+    return response
 
 @app.route('/api/move_piece', methods=['POST'])
 def move_piece():
-    global game
-    if game is None:
-        return jsonify({'error': 'Game not initialized'}), 400
-
-    data = request.json
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return json_response({'error': 'Invalid data'}), 400
     piece_id = data.get('piece_id')
     x = data.get('x')
     y = data.get('y')
 
-    if piece_id is not None and x is not None and y is not None:
-        for piece in game.pieces:
-            if piece.piece_id == piece_id and not piece.is_placed:
-                piece.x = x
-                piece.y = y
-
-                # Check if piece is near correct position
-                if piece.is_near_correct_position():
-                    piece.x = piece.correct_x
-                    piece.y = piece.correct_y
-                    piece.is_placed = True
-
-                    # Check if puzzle is complete
-                    if all(p.is_placed for p in game.pieces):
-                        level_score = game.complete_level()
-                        return jsonify({
-                            'success': True,
-                            'piece_placed': True,
-                            'puzzle_complete': True,
-                            'level_score': level_score,
-                            'game_state': game.get_game_state()
-                        })
-                    else:
-                        return jsonify({
-                            'success': True,
-                            'piece_placed': True,
-                            'puzzle_complete': False,
-                            'game_state': game.get_game_state()
-                        })
-                break
-
-        return jsonify({'success': True, 'game_state': game.get_game_state()})
-
-    return jsonify({'error': 'Invalid data'}), 400
+    with game_lock:
+        game.load_progress()
+        try:
+            placed = game.move_piece(piece_id, x, y)
+        except ValueError:
+            return json_response({'error': 'Invalid data'}), 400
+        if placed:
+            # Check if puzzle is complete
+            if game.placed.all():
+                level_score = game.complete_level()
+                return json_response({
+                    'success': True,
+                    'piece_placed': True,
+                    'puzzle_complete': True,
+                    'level_score': level_score,
+                    'game_state': game.get_state_update()
+                })
+            else:
+                return json_response({
+                    'success': True,
+                    'piece_placed': True,
+                    'puzzle_complete': False,
+                    'game_state': game.get_state_update()
+                })
+
+        return json_response({'success': True, 'game_state': game.get_state_update()})
 
 @app.route('/api/use_hint', methods=['POST'])
 def use_hint():
-    global game
-    if game is None:
-        return jsonify({'error': 'Game not initialized'}), 400
-
-    if game.use_hint():
-        return jsonify({
-            'success': True,
-            'message': 'Hint revealed!',
-            'game_state': game.get_game_state()
-        })
-    else:
-        return jsonify({
-            'success': False,
-            'message': 'Hint not available yet!',
-            'game_state': game.get_game_state()
-        })
+    with game_lock:
+        game.load_progress()
+        if game.use_hint():
+            return json_response({
+                'success': True,
+                'message': 'Hint revealed!',
+                'game_state': game.get_state_update()
+            })
+        else:
+            return json_response({
+                'success': False,
+                'message': 'Hint not available yet!',
+                'game_state': game.get_state_update()
+            })
 
 @app.route('/api/next_level', methods=['POST'])
 def next_level():
-    global game
-    if game is None:
-        return jsonify({'error': 'Game not initialized'}), 400
+    with game_lock:
+        game.load_progress()
+        if not game.puzzle_complete:
+            return json_response({'error': 'Level not complete'}), 400
 
-    if game.puzzle_complete:
         if game.current_level < len(game.levels) - 1:
             game.next_level()
         else:
             # Restart from level 1
             game.current_level = 0
             game.load_level(game.current_level)
+        game.save_progress()
 
-        return jsonify({
+        return json_response({
             'success': True,
             'game_state': game.get_game_state()
         })
 
-    return jsonify({'error': 'Level not complete'}), 400
-
 @app.route('/api/reset_game', methods=['POST'])
 def reset_game():
     global game
-    game = JigsawPuzzleGame()
-    return jsonify({
-        'success': True,
-        'game_state': game.get_game_state()
-    })
+    with game_lock:
+        game = JigsawPuzzleGame()
+        game.load_progress()
+        return json_response({
+            'success': True,
+            'game_state': game.get_game_state()
+        })
 
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", 5000))
@@ -1,4 +1,5 @@
 import pygame
+import numpy as np
 from flask import Flask
 import random
 import math
@@ -7,14 +8,80 @@ import json
 import os
 from datetime import datetime, timedelta
 from enum import Enum
+from operator import attrgetter
 from dataclasses import dataclass
-from typing import List, Any, Optional, Tuple
+from typing import List, Any, Optional, Tuple, Callable
 import threading
 
 
-def clamp_color(value):
-    """Ensure color values are within valid range (0-255)."""
-    return max(0, min(255, int(value)))
+# Trig tables shared by every sunflower: 12 petals and 20 seeds per flower
+PETAL_ANGLES = np.radians(np.arange(0, 360, 30))
+PETAL_COS = np.cos(PETAL_ANGLES)
+PETAL_SIN = np.sin(PETAL_ANGLES)
+SEED_ANGLES = np.radians(np.arange(20) * 18)
+SEED_COS = np.cos(SEED_ANGLES)
+SEED_SIN = np.sin(SEED_ANGLES)
+
+def fill_vertical_gradient(surface, red, green, blue):
+    """Write per-row channel arrays into the top rows of surface in one pass."""
+    rows = np.stack(np.broadcast_arrays(red, green, blue), axis=-1)
+    rows = np.clip(rows, 0, 255).astype(np.uint8)
+    pixels = pygame.surfarray.pixels3d(surface)
+    pixels[:, :rows.shape[0]] = rows[None, :, :]
+    del pixels  # unlock the surface
+
+# Border colors for each piece state
+BORDER_COLORS = {
+    'placed': (0, 255, 0),  # Green for placed
+    'hinted': (255, 255, 0),  # Yellow for hinted
+    'dragging': (255, 100, 100),  # Red for dragging
+    'normal': (255, 255, 255),  # White for normal
+}
+BORDER_COLORKEY = (0, 0, 0)  # transparent interior of the border surfaces
+
+def build_border_surfaces(width, height):
+    """Pre-render a 2px outline of the given size for every state.
+
+    The outlines are opaque, so the interior is cut out with an RLE colorkey
+    instead of per-pixel alpha; blitting one then only copies the outline.
+    """
+    border_surfs = {}
+    for state, color in BORDER_COLORS.items():
+        border_surf = pygame.Surface((width, height)).convert()
+        border_surf.fill(BORDER_COLORKEY)
+        pygame.draw.rect(border_surf, color, border_surf.get_rect(), 2)
+        border_surf.set_colorkey(BORDER_COLORKEY, pygame.RLEACCEL)
+        border_surfs[state] = border_surf
+    return border_surfs
+
+def merge_rects(rects):
+    """Union overlapping rects so no screen area appears twice."""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+# Levels with fewer pieces than this are hit-tested with a plain Python loop
+HIT_TEST_NUMPY_MIN = 16
+
+# Pending progress is written at most this often from the main loop
+PROGRESS_SAVE_INTERVAL_S = 5.0
+
+# Window events after which the window contents may be stale or lost, so
+# the next frame must be presented in full rather than as dirty rects
+FULL_PRESENT_EVENTS = (
+    pygame.WINDOWEXPOSED,
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWSHOWN,
+    pygame.WINDOWRESTORED,
+    pygame.WINDOWMAXIMIZED,
+    pygame.WINDOWFOCUSGAINED,
+)
 
 class HintType(Enum):
     """Types of hints available in the enhanced hint system."""
@@ -29,7 +96,7 @@ class HintType(Enum):
 class PuzzleLevel:
     """Represents a puzzle level with image and metadata."""
     name: str
-    image_url: str
+    image_url: Callable[[], pygame.Surface]  # draws the level image on demand
     description: str
     difficulty: int  # 1-5
     grid_size: tuple
@@ -49,38 +116,103 @@ class PuzzleRegion:
         return (self.x <= px <= self.x + self.width and
                 self.y <= py <= self.y + self.height)
 
-class PuzzlePiece:
-    def __init__(self, x, y, width, height, image_section, correct_x, correct_y, piece_id):
-        self.x = x
-        self.y = y
+class PuzzlePiece(pygame.sprite.DirtySprite):
+    def __init__(self, x, y, width, height, image_section, correct_x, correct_y, piece_id,
+                 border_surfs=None):
+        super().__init__()
+        self.rect = pygame.Rect(x, y, width, height)
         self.width = width
         self.height = height
         self.image_section = image_section
+        self.border_surfs = border_surfs or build_border_surfaces(width, height)
         self.correct_x = correct_x
         self.correct_y = correct_y
         self.piece_id = piece_id
-        self.is_placed = False
-        self.dragging = False
-        self.hint_revealed = False
+        self.z_order = piece_id  # higher draws on top
+        self._is_placed = False
+        self._dragging = False
+        self._hint_revealed = False
         self.rotation = 0  # For future rotation feature
-
-    def draw(self, screen, alpha=255):
-        if self.image_section:
-            temp_surface = self.image_section.copy()
-            temp_surface.set_alpha(alpha)
-            screen.blit(temp_surface, (self.x, self.y))
-
-            # Draw border with different colors for different states
-            if self.is_placed:
-                color = (0, 255, 0)  # Green for placed
-            elif self.hint_revealed:
-                color = (255, 255, 0)  # Yellow for hinted
-            elif self.dragging:
-                color = (255, 100, 100)  # Red for dragging
-            else:
-                color = (255, 255, 255)  # White for normal
-
-            pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height), 2)
+        self._hint_surface = None  # image_section faded for hints, built on first use
+        self.render()
+
+    # Moving a piece or changing its state marks the sprite dirty so only
+    # its old and new rects are redrawn on the next frame
+    @property
+    def x(self):
+        return self.rect.x
+
+    @x.setter
+    def x(self, value):
+        self.rect.x = value
+        self.dirty = 1
+
+    @property
+    def y(self):
+        return self.rect.y
+
+    @y.setter
+    def y(self, value):
+        self.rect.y = value
+        self.dirty = 1
+
+    @property
+    def is_placed(self):
+        return self._is_placed
+
+    @is_placed.setter
+    def is_placed(self, value):
+        self._is_placed = value
+        self.render()
+
+    @property
+    def dragging(self):
+        return self._dragging
+
+    @dragging.setter
+    def dragging(self, value):
+        self._dragging = value
+        self.render()
+
+    @property
+    def hint_revealed(self):
+        return self._hint_revealed
+
+    @hint_revealed.setter
+    def hint_revealed(self, value):
+        self._hint_revealed = value
+        self.render()
+
+    def render(self):
+        """Pick the body and border surfaces for the piece's current state."""
+        # Border with different colors for different states
+        if self.is_placed:
+            state = 'placed'
+        elif self.hint_revealed:
+            state = 'hinted'
+        elif self.dragging:
+            state = 'dragging'
+        else:
+            state = 'normal'
+
+        if self.hint_revealed and not self.is_placed:
+            # Slightly transparent for hints; the border stays opaque
+            if self._hint_surface is None:
+                # Opaque copy in the display format with surface alpha: blits
+                # through SDL's per-surface alpha path rather than per-pixel
+                # blending (convert_alpha would force the per-pixel blender)
+                self._hint_surface = self.image_section.convert()
+                self._hint_surface.set_alpha(220)
+            self.image = self._hint_surface
+        else:
+            self.image = self.image_section
+        self.border = self.border_surfs[state]
+        self.dirty = 1
+
+    def get_blit_tuples(self, clip):
+        """Return the blits that draw the part of the piece inside screen rect clip."""
+        area = clip.move(-self.rect.x, -self.rect.y)
+        return [(self.image, clip, area), (self.border, clip, area)]
 
     def contains_point(self, px, py):
         return (self.x <= px <= self.x + self.width and
@@ -90,6 +222,18 @@ class PuzzlePiece:
         return (abs(self.x - self.correct_x) < tolerance and
                 abs(self.y - self.correct_y) < tolerance)
 
+class UiLayer(pygame.sprite.DirtySprite):
+    """Transparent full-screen sprite the user interface is drawn onto."""
+
+    def __init__(self, size):
+        super().__init__()
+        self.image = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        self.rect = self.image.get_rect()
+
+    def get_blit_tuples(self, clip):
+        """Return the blit that draws the part of the layer inside screen rect clip."""
+        return [(self.image, clip, clip)]
+
 class JigsawPuzzle:
     def __init__(self):
         pygame.init()
@@ -108,6 +252,7 @@ class JigsawPuzzle:
         self.total_score = 0
         self.level_start_time = None
         self.puzzle_complete = False
+        self._score_cache = None  # (cache key, score) for the current second
 
         # Puzzle dimensions
         self.puzzle_width = 600
@@ -119,37 +264,90 @@ class JigsawPuzzle:
         self.pieces_area_x = 700
         self.pieces_area_y = 100
 
-        # Initialize levels
+        # One RNG instance for level images, hints and scrambling
+        self._rng = random.Random()
+
+        # Initialize levels; images are drawn lazily by load_level
         self.levels = self.create_levels()
+        self._level_surfaces = {}
 
         # Game variables
         self.pieces = []
         self.selected_piece = None
         self.mouse_offset_x = 0
         self.mouse_offset_y = 0
+        # Hit-test arrays indexed by piece_id, synced when a piece is picked or dropped
+        self._piece_xy = np.zeros((0, 2), dtype=np.int32)
+        self._piece_placed = np.zeros(0, dtype=bool)
+        self._piece_z = np.zeros(0, dtype=np.int64)
 
         # Hint system
-        self.save_file = "puzzle_progress.json"
+        self.save_file = "puzzle_progress.txt"
+        self.legacy_save_file = "puzzle_progress.json"
+        self._progress_dirty = False
+        self._next_save_time = 0.0
         self.load_progress()
 
         # UI elements
         self.next_button_rect = pygame.Rect(900, 600, 150, 50)
         self.hint_button_rect = pygame.Rect(900, 550, 150, 40)
 
+        # Dirty-rect rendering: pieces and a transparent UI layer are sprites
+        # drawn over a cached background, and each frame only redraws the
+        # areas that changed, in one batched blits call
+        self.board_rect = pygame.Rect(self.puzzle_x - 5, self.puzzle_y - 5,
+                                      self.puzzle_width + 10, self.puzzle_height + 10)
+        self.background = pygame.Surface((self.screen_width, self.screen_height)).convert()
+        self.background.fill((40, 40, 60))  # Dark blue background
+        self._draw_order = []  # pieces sorted by z_order; the UI layer draws last
+        self._z_counter = 0  # next z_order for a raised piece
+        self._drawn_rects = {}  # sprite -> rect it was last drawn at
+        self._repaint_rects = []  # screen areas queued for the next frame
+        self._full_redraw = True  # present the next frame with flip()
+        self._frame_dirty = True  # input or game state changed since the last frame
+        self.ui_layer = UiLayer((self.screen_width, self.screen_height))
+        self._ui_dirty = True  # set when something the UI shows has changed
+        self._ui_second = None  # second the time-dependent UI values were sampled
+        self._ui_clock_state = None  # (level score, hint available, hint timer)
+        self._hint_cache_tick = -1  # get_ticks() second the hint fields were computed
+        self._hint_available = True
+        self._hint_timer_str = None
+        self._board_dirty = True
+        self._hint_overlay = None  # composed overlay, rebuilt when the hinted set changes
+        self._hint_rings = []  # highlight rects of the hinted pieces, in overlay space
+        self._text_slots = {}  # UI slot -> (last text, rendered surface)
+        self._text_cache = {}  # (font, text, color) -> rendered surface
+
+        # The instruction lines never change, so keep them as one blit sequence
+        instructions = [
+            "Drag pieces to assemble the puzzle",
+            "Click HINT button for help (every 2 hours)",
+            "Green border = correctly placed",
+            "Yellow border = hinted piece",
+            "Red border = currently dragging"
+        ]
+        self._instruction_surfaces = [
+            (self.small_font.render(instruction, True, (180, 180, 180)), (50, 600 + i * 20))
+            for i, instruction in enumerate(instructions)
+        ]
+        # Level numbers for the progression indicator
+        self._digit_surfs = [self.small_font.render(str(i + 1), True, (0, 0, 0))
+                             for i in range(len(self.levels))]
+
         # Load first level
         self.load_level(self.current_level)
 
     def create_levels(self):
         """Create puzzle levels with different themes and difficulties."""
         return [
-            PuzzleLevel("Cute Cat", self.create_cat_image(), "Adorable orange tabby cat", 1, (3, 2), 100),
-            PuzzleLevel("Mona Lisa", self.create_monalisa_image(), "Leonardo da Vinci's masterpiece", 2, (4, 3), 200),
-            PuzzleLevel("Starry Night", self.create_starry_night_image(), "Van Gogh's swirling sky", 3, (4, 3), 300),
-            PuzzleLevel("Sunflowers", self.create_sunflower_image(), "Bright yellow sunflower field", 2, (3, 3), 250),
-            PuzzleLevel("Mountain Lake", self.create_landscape_image(), "Serene mountain reflection", 3, (5, 3), 350),
-            PuzzleLevel("Abstract Art", self.create_abstract_image(), "Colorful geometric patterns", 4, (4, 4), 400),
-            PuzzleLevel("City Skyline", self.create_city_image(), "Modern urban landscape", 4, (5, 4), 450),
-            PuzzleLevel("Ocean Waves", self.create_ocean_image(), "Crashing ocean waves", 5, (6, 4), 500),
+            PuzzleLevel("Cute Cat", self.create_cat_image, "Adorable orange tabby cat", 1, (3, 2), 100),
+            PuzzleLevel("Mona Lisa", self.create_monalisa_image, "Leonardo da Vinci's masterpiece", 2, (4, 3), 200),
+            PuzzleLevel("Starry Night", self.create_starry_night_image, "Van Gogh's swirling sky", 3, (4, 3), 300),
+            PuzzleLevel("Sunflowers", self.create_sunflower_image, "Bright yellow sunflower field", 2, (3, 3), 250),
+            PuzzleLevel("Mountain Lake", self.create_landscape_image, "Serene mountain reflection", 3, (5, 3), 350),
+            PuzzleLevel("Abstract Art", self.create_abstract_image, "Colorful geometric patterns", 4, (4, 4), 400),
+            PuzzleLevel("City Skyline", self.create_city_image, "Modern urban landscape", 4, (5, 4), 450),
+            PuzzleLevel("Ocean Waves", self.create_ocean_image, "Crashing ocean waves", 5, (6, 4), 500),
         ]
 
     def create_cat_image(self):
@@ -194,11 +392,12 @@ class JigsawPuzzle:
             y = 150 + i * 20
             pygame.draw.line(surface, (200, 100, 0), (250, y), (350, y), 3)
 
-        # Grass
-        for x in range(0, 600, 20):
-            for blade in range(3):
-                blade_x = x + random.randint(0, 15)
-                pygame.draw.line(surface, (34, 139, 34), (blade_x, 400), (blade_x, 380 + random.randint(0, 20)), 2)
+        # Grass - three blades per 20px column, offsets drawn in one batch
+        np_rng = np.random.default_rng(self._rng.getrandbits(32))
+        blade_xs = np.arange(0, 600, 20)[:, None] + np_rng.integers(0, 16, (30, 3))
+        blade_tops = 380 + np_rng.integers(0, 21, (30, 3))
+        for blade_x, blade_top in zip(blade_xs.ravel().tolist(), blade_tops.ravel().tolist()):
+            pygame.draw.line(surface, (34, 139, 34), (blade_x, 400), (blade_x, blade_top), 2)
 
         return surface
 
@@ -207,9 +406,9 @@ class JigsawPuzzle:
         surface = pygame.Surface((600, 450))
 
         # Background - renaissance style
-        for y in range(450):
-            color_val = clamp_color(100 + 50 * (y / 450))
-            surface.fill((color_val, clamp_color(color_val - 20), clamp_color(color_val - 30)), (0, y, 600, 1))
+        ys = np.arange(450)
+        color_val = np.clip((100 + 50 * (ys / 450)).astype(int), 0, 255)
+        fill_vertical_gradient(surface, color_val, color_val - 20, color_val - 30)
 
         # Face shape
         pygame.draw.ellipse(surface, (245, 220, 177), (200, 120, 200, 250))
@@ -244,26 +443,27 @@ class JigsawPuzzle:
         surface = pygame.Surface((600, 450))
 
         # Night sky with swirls
-        for y in range(300):
-            blue_val = clamp_color(25 + 30 * math.sin(y / 20))
-            surface.fill((blue_val, clamp_color(blue_val + 10), clamp_color(blue_val + 40)), (0, y, 600, 1))
+        ys = np.arange(300)
+        blue_val = np.clip((25 + 30 * np.sin(ys / 20.0)).astype(int), 0, 255)
+        fill_vertical_gradient(surface, blue_val, blue_val + 10, blue_val + 40)
 
         # Ground/village
         surface.fill((40, 40, 80), (0, 300, 600, 150))
 
-        # Swirls in the sky
+        # Swirls in the sky; ring colors stay within 65-140, so no clamping
+        rings = [(radius, (100 - radius, 100 - radius, 150 - radius))
+                 for radius in range(10, 40, 5)]
         for i in range(8):
             center_x = 100 + i * 60
-            center_y = 100 + random.randint(0, 50)
-            for radius in range(10, 40, 5):
-                color_intensity = clamp_color(100 - radius)
-                pygame.draw.circle(surface, (color_intensity, color_intensity, clamp_color(color_intensity + 50)),
-                                (center_x, center_y), radius, 2)
-
-        # Stars
-        for i in range(30):
-            x = random.randint(0, 600)
-            y = random.randint(0, 250)
+            center_y = 100 + self._rng.randint(0, 50)
+            for radius, color in rings:
+                pygame.draw.circle(surface, color, (center_x, center_y), radius, 2)
+
+        # Stars - all 30 positions drawn in one batch
+        np_rng = np.random.default_rng(self._rng.getrandbits(32))
+        star_xs = np_rng.integers(0, 601, 30).tolist()
+        star_ys = np_rng.integers(0, 251, 30).tolist()
+        for x, y in zip(star_xs, star_ys):
             pygame.draw.circle(surface, (255, 255, 200), (x, y), 3)
 
         # Moon
@@ -297,13 +497,15 @@ class JigsawPuzzle:
         # Multiple sunflowers
         sunflower_positions = [(150, 250), (350, 200), (500, 280), (80, 300), (420, 320)]
 
+        rng = self._rng
+        np_rng = np.random.default_rng(rng.getrandbits(32))
         for x, y in sunflower_positions:
-            size = random.randint(40, 70)
+            size = rng.randint(40, 70)
 
             # Petals
-            for angle in range(0, 360, 30):
-                petal_x = x + math.cos(math.radians(angle)) * size
-                petal_y = y + math.sin(math.radians(angle)) * size
+            petal_xs = (x + PETAL_COS * size).tolist()
+            petal_ys = (y + PETAL_SIN * size).tolist()
+            for petal_x, petal_y in zip(petal_xs, petal_ys):
                 pygame.draw.ellipse(surface, (255, 215, 0),
                                 (petal_x - 15, petal_y - 8, 30, 16))
 
@@ -311,12 +513,11 @@ class JigsawPuzzle:
             pygame.draw.circle(surface, (139, 69, 19), (x, y), size // 2)
 
             # Seeds pattern
-            for i in range(20):
-                seed_angle = i * 18
-                seed_radius = random.randint(5, size // 3)
-                seed_x = x + math.cos(math.radians(seed_angle)) * seed_radius
-                seed_y = y + math.sin(math.radians(seed_angle)) * seed_radius
-                pygame.draw.circle(surface, (101, 67, 33), (int(seed_x), int(seed_y)), 2)
+            seed_radii = np_rng.integers(5, size // 3 + 1, 20)
+            seed_xs = (x + SEED_COS * seed_radii).astype(int).tolist()
+            seed_ys = (y + SEED_SIN * seed_radii).astype(int).tolist()
+            for seed_x, seed_y in zip(seed_xs, seed_ys):
+                pygame.draw.circle(surface, (101, 67, 33), (seed_x, seed_y), 2)
 
             # Stem
             pygame.draw.line(surface, (34, 139, 34), (x, y + size // 2), (x, 450), 8)
@@ -324,7 +525,7 @@ class JigsawPuzzle:
         # Clouds
         for i in range(3):
             cloud_x = 100 + i * 200
-            cloud_y = 50 + random.randint(0, 30)
+            cloud_y = 50 + rng.randint(0, 30)
             pygame.draw.circle(surface, (255, 255, 255), (cloud_x, cloud_y), 30)
             pygame.draw.circle(surface, (255, 255, 255), (cloud_x + 25, cloud_y), 35)
             pygame.draw.circle(surface, (255, 255, 255), (cloud_x + 50, cloud_y), 30)
@@ -336,9 +537,9 @@ class JigsawPuzzle:
         surface = pygame.Surface((600, 450))
 
         # Sky gradient
-        for y in range(200):
-            blue = clamp_color(135 + 100 * (1 - y / 200))
-            surface.fill((blue, clamp_color(blue + 50), 255), (0, y, 600, 1))
+        ys = np.arange(200)
+        blue = np.clip((135 + 100 * (1 - ys / 200)).astype(int), 0, 255)
+        fill_vertical_gradient(surface, blue, blue + 50, 255)
 
         # Mountains
         mountain_points = [(0, 200), (150, 80), (300, 120), (450, 60), (600, 180), (600, 200)]
@@ -353,18 +554,18 @@ class JigsawPuzzle:
         # Lake
         pygame.draw.ellipse(surface, (30, 144, 255), (50, 200, 500, 150))
 
-        # Lake reflection
-        for y in range(200, 350):
-            alpha = clamp_color(100 * (1 - (y - 200) / 150))
-            reflection_surface = pygame.Surface((500, 1))
-            reflection_surface.set_alpha(alpha)
-            reflection_surface.fill((100, 100, 100))
-            surface.blit(reflection_surface, (50, y))
+        # Lake reflection: one grey surface whose alpha fades row by row
+        reflection_surface = pygame.Surface((500, 150), pygame.SRCALPHA)
+        reflection_surface.fill((100, 100, 100, 0))
+        alphas = pygame.surfarray.pixels_alpha(reflection_surface)
+        alphas[:] = np.clip(100 * (1 - np.arange(150) / 150), 0, 255).astype(np.uint8)
+        del alphas  # unlock the surface
+        surface.blit(reflection_surface, (50, 200))
 
         # Trees
         for i in range(8):
             x = 80 + i * 60
-            height = random.randint(40, 80)
+            height = self._rng.randint(40, 80)
             pygame.draw.rect(surface, (139, 69, 19), (x, 200 - height, 10, height))
             pygame.draw.circle(surface, (34, 139, 34), (x + 5, 200 - height), 15)
 
@@ -378,27 +579,37 @@ class JigsawPuzzle:
         colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0),
                 (255, 0, 255), (0, 255, 255), (255, 165, 0), (128, 0, 128)]
 
-        # Geometric shapes
-        for i in range(15):
-            color = random.choice(colors)
-            shape_type = random.randint(1, 4)
-            x = random.randint(0, 500)
-            y = random.randint(0, 350)
+        # Geometric shapes - every shape's parameters drawn in one batch
+        count = 15
+        np_rng = np.random.default_rng(self._rng.getrandbits(32))
+        shape_colors = self._rng.choices(colors, k=count)
+        shape_types = np_rng.integers(1, 5, count).tolist()
+        xs = np_rng.integers(0, 501, count).tolist()
+        ys = np_rng.integers(0, 351, count).tolist()
+        radii = np_rng.integers(20, 81, count).tolist()
+        sizes = np_rng.integers(30, 101, (count, 2)).tolist()
+        corners = np_rng.integers(20, 81, (count, 4)).tolist()
+        line_ends = np_rng.integers(-100, 101, (count, 2)).tolist()
+
+        for i in range(count):
+            color = shape_colors[i]
+            shape_type = shape_types[i]
+            x = xs[i]
+            y = ys[i]
 
             if shape_type == 1:  # Circle
-                radius = random.randint(20, 80)
+                radius = radii[i]
                 pygame.draw.circle(surface, color, (x, y), radius)
             elif shape_type == 2:  # Rectangle
-                w = random.randint(30, 100)
-                h = random.randint(30, 100)
+                w, h = sizes[i]
                 pygame.draw.rect(surface, color, (x, y, w, h))
             elif shape_type == 3:  # Triangle
-                points = [(x, y), (x + random.randint(20, 80), y + random.randint(20, 80)),
-                        (x - random.randint(20, 80), y + random.randint(20, 80))]
+                dx1, dy1, dx2, dy2 = corners[i]
+                points = [(x, y), (x + dx1, y + dy1), (x - dx2, y + dy2)]
                 pygame.draw.polygon(surface, color, points)
             else:  # Lines
-                end_x = x + random.randint(-100, 100)
-                end_y = y + random.randint(-100, 100)
+                end_x = x + line_ends[i][0]
+                end_y = y + line_ends[i][1]
                 pygame.draw.line(surface, color, (x, y), (end_x, end_y), 5)
 
         return surface
@@ -408,10 +619,10 @@ class JigsawPuzzle:
         surface = pygame.Surface((600, 450))
 
         # Sky gradient (sunset)
-        for y in range(300):
-            red = clamp_color(255 * (1 - y / 300))
-            blue = clamp_color(100 + 155 * (y / 300))
-            surface.fill((red, 100, blue), (0, y, 600, 1))
+        ys = np.arange(300)
+        red = (255 * (1 - ys / 300)).astype(int)
+        blue = (100 + 155 * (ys / 300)).astype(int)
+        fill_vertical_gradient(surface, red, 100, blue)
 
         # Ground
         surface.fill((50, 50, 50), (0, 300, 600, 150))
@@ -432,7 +643,7 @@ class JigsawPuzzle:
                 for col in range(building_width // 20):
                     window_x = x + 5 + col * 20
                     window_y = y + 10 + row * 25
-                    if random.random() > 0.3:  # Some windows are lit
+                    if self._rng.random() > 0.3:  # Some windows are lit
                         pygame.draw.rect(surface, (255, 255, 100), (window_x, window_y, 10, 15))
                     else:
                         pygame.draw.rect(surface, (30, 30, 30), (window_x, window_y, 10, 15))
@@ -452,26 +663,25 @@ class JigsawPuzzle:
         # Ocean layers
         ocean_colors = [(0, 100, 150), (0, 120, 170), (0, 140, 190), (0, 160, 210)]
 
+        wave_xs = np.arange(0, 600, 20)
         for i, color in enumerate(ocean_colors):
             y = 150 + i * 75
-            # Create wave effect
-            points = [(0, y)]
-            for x in range(0, 600, 20):
-                wave_y = y + 20 * math.sin((x + i * 50) / 30)
-                points.append((x, int(wave_y)))
-            points.append((600, 450))
-            points.append((0, 450))
+            # Create wave effect - every crest of the layer in one pass
+            wave_ys = (y + 20 * np.sin((wave_xs + i * 50) / 30)).astype(int)
+            points = [(0, y), *zip(wave_xs.tolist(), wave_ys.tolist()), (600, 450), (0, 450)]
             pygame.draw.polygon(surface, color, points)
 
         # Foam on waves
-        for x in range(0, 600, 30):
-            foam_y = 200 + 15 * math.sin(x / 20)
-            pygame.draw.circle(surface, (255, 255, 255), (x, int(foam_y)), 5)
+        foam_xs = np.arange(0, 600, 30)
+        foam_ys = (200 + 15 * np.sin(foam_xs / 20)).astype(int)
+        for x, foam_y in zip(foam_xs.tolist(), foam_ys.tolist()):
+            pygame.draw.circle(surface, (255, 255, 255), (x, foam_y), 5)
 
         # Seagulls
+        rng = self._rng
         for i in range(5):
-            x = random.randint(100, 500)
-            y = random.randint(50, 150)
+            x = rng.randint(100, 500)
+            y = rng.randint(50, 150)
             # Simple V shape for seagull
             pygame.draw.line(surface, (100, 100, 100), (x - 10, y), (x, y - 5), 2)
             pygame.draw.line(surface, (100, 100, 100), (x, y - 5), (x + 10, y), 2)
@@ -479,11 +689,11 @@ class JigsawPuzzle:
         # Clouds
         for i in range(4):
             x = 50 + i * 140
-            y = 30 + random.randint(0, 40)
+            y = 30 + rng.randint(0, 40)
             for j in range(3):
                 pygame.draw.circle(surface, (255, 255, 255),
-                                (x + j * 20, y + random.randint(-10, 10)),
-                                random.randint(15, 25))
+                                (x + j * 20, y + rng.randint(-10, 10)),
+                                rng.randint(15, 25))
 
         return surface
 
@@ -493,21 +703,54 @@ class JigsawPuzzle:
             return False
 
         level = self.levels[level_index]
-        self.current_image = level.image_url  # This is actually our generated surface
+
+        # Draw the level image on first visit, converted to the display format
+        self.current_image = self._level_surfaces.get(level_index)
+        if self.current_image is None:
+            self.current_image = level.image_url().convert()
+            self._level_surfaces[level_index] = self.current_image
         self.grid_cols, self.grid_rows = level.grid_size
         self.piece_width = self.puzzle_width // self.grid_cols
         self.piece_height = self.puzzle_height // self.grid_rows
 
-        # Scale the generated image
-        self.original_image = pygame.transform.scale(self.current_image,
-                                                (self.puzzle_width, self.puzzle_height))
+        # Scale the generated image; level images are normally drawn at the
+        # puzzle size already, and pieces are views into it either way
+        puzzle_size = (self.puzzle_width, self.puzzle_height)
+        if self.current_image.get_size() == puzzle_size:
+            self.original_image = self.current_image
+        else:
+            self.original_image = pygame.transform.smoothscale(self.current_image, puzzle_size).convert()
 
         self.pieces = []
+        self._placed_count = 0
+        self._active_hint_count = 0  # hinted pieces not yet placed
+        self._hint_overlay = None
         self.puzzle_complete = False
         self.level_start_time = time.time()
 
+        # Every piece of a level shares one outline surface per border state
+        self._border_surfs = build_border_surfaces(self.piece_width, self.piece_height)
+
         self.create_pieces()
+        self._total_pieces = len(self.pieces)
         self.scramble_pieces()
+        self.build_hit_index()
+
+        self._draw_order = list(self.pieces)  # z_order starts at piece_id
+        self._z_counter = self._total_pieces
+        self._drawn_rects = {}
+        self.request_full_present()
+        self._ui_dirty = True  # redrawing the full-screen UI layer repaints everything
+
+        # Title, description and difficulty only change with the level
+        level_info = f"Level {level_index + 1}: {level.name}"
+        self._title_surf = self.render_static_text(self.font, level_info, (255, 255, 255))
+        self._desc_surf = self.render_static_text(self.small_font, level.description, (200, 200, 200))
+        stars_text = "★" * level.difficulty + "☆" * (5 - level.difficulty)
+        self._stars_surf = self.render_static_text(self.small_font, f"Difficulty: {stars_text}",
+                                                   (255, 255, 100))
+        self.build_progress_surface()
+        self._board_dirty = True
         return True
 
     def create_pieces(self):
@@ -515,10 +758,11 @@ class JigsawPuzzle:
         piece_id = 0
         for row in range(self.grid_rows):
             for col in range(self.grid_cols):
-                # Extract piece from original image
+                # Pieces are views into original_image, which stays referenced
+                # for the level's lifetime; their pixels are never modified
                 piece_rect = pygame.Rect(col * self.piece_width, row * self.piece_height,
                                     self.piece_width, self.piece_height)
-                piece_image = self.original_image.subsurface(piece_rect).copy()
+                piece_image = self.original_image.subsurface(piece_rect)
 
                 # Correct position in puzzle
                 correct_x = self.puzzle_x + col * self.piece_width
@@ -526,40 +770,63 @@ class JigsawPuzzle:
 
                 # Create piece
                 piece = PuzzlePiece(0, 0, self.piece_width, self.piece_height,
-                                piece_image, correct_x, correct_y, piece_id)
+                                piece_image, correct_x, correct_y, piece_id,
+                                border_surfs=self._border_surfs)
                 self.pieces.append(piece)
                 piece_id += 1
 
     def scramble_pieces(self):
         """Scramble pieces more randomly across the pieces area."""
-        available_positions = []
+        rng = np.random.default_rng(self._rng.getrandbits(32))
+        count = len(self.pieces)
 
-        # Create a grid of available positions in the pieces area
+        # Deal the pieces into a shuffled 4-column grid in the pieces area,
+        # jittered and kept within screen bounds in one pass
         cols = 4
-        rows = (len(self.pieces) + cols - 1) // cols  # Ceiling division
-
-        for row in range(rows + 2):  # Add extra rows for more scrambling
-            for col in range(cols):
-                x = self.pieces_area_x + col * (self.piece_width + 15) + random.randint(-20, 20)
-                y = self.pieces_area_y + row * (self.piece_height + 15) + random.randint(-10, 10)
-                available_positions.append((x, y))
-
-        # Shuffle the positions
-        random.shuffle(available_positions)
+        slots = rng.permutation(count)
+        xs = (self.pieces_area_x + slots % cols * (self.piece_width + 15)
+              + rng.integers(-50, 51, count))
+        ys = (self.pieces_area_y + slots // cols * (self.piece_height + 15)
+              + rng.integers(-30, 31, count))
+        np.clip(xs, self.pieces_area_x - 50, self.screen_width - self.piece_width, out=xs)
+        np.clip(ys, 50, self.screen_height - self.piece_height - 100, out=ys)
 
         # Assign positions to pieces
-        for i, piece in enumerate(self.pieces):
-            if not piece.is_placed and i < len(available_positions):
-                piece.x, piece.y = available_positions[i]
-
-                # Add some random rotation-like displacement
-                piece.x += random.randint(-30, 30)
-                piece.y += random.randint(-20, 20)
-
-                # Keep pieces within screen bounds
-                piece.x = max(self.pieces_area_x - 50,
-                            min(self.screen_width - piece.width, piece.x))
-                piece.y = max(50, min(self.screen_height - piece.height - 100, piece.y))
+        for piece, x, y in zip(self.pieces, xs.tolist(), ys.tolist()):
+            if not piece.is_placed:
+                piece.x, piece.y = x, y
+
+    def build_hit_index(self):
+        """Snapshot every piece's position, placement and z-order into arrays."""
+        self._piece_xy = np.array([(piece.x, piece.y) for piece in self.pieces],
+                                  dtype=np.int32).reshape(-1, 2)
+        self._piece_placed = np.array([piece.is_placed for piece in self.pieces], dtype=bool)
+        self._piece_z = np.array([piece.z_order for piece in self.pieces], dtype=np.int64)
+
+    def sync_hit_index(self, piece):
+        """Copy one piece's current state into the hit-test arrays."""
+        i = piece.piece_id
+        self._piece_xy[i] = piece.x, piece.y
+        self._piece_placed[i] = piece.is_placed
+        self._piece_z[i] = piece.z_order
+
+    def piece_at(self, pos):
+        """Return the topmost unplaced piece containing pos, or None."""
+        px, py = pos
+        if self._total_pieces < HIT_TEST_NUMPY_MIN:
+            for piece in reversed(self._draw_order):  # Check from top to bottom
+                if piece.contains_point(px, py) and not piece.is_placed:
+                    return piece
+            return None
+
+        xs = self._piece_xy[:, 0]
+        ys = self._piece_xy[:, 1]
+        hits = np.nonzero((xs <= px) & (px <= xs + self.piece_width) &
+                          (ys <= py) & (py <= ys + self.piece_height) &
+                          ~self._piece_placed)[0]
+        if hits.size == 0:
+            return None
+        return self.pieces[hits[np.argmax(self._piece_z[hits])]]
 
     def calculate_level_score(self):
         """Calculate score based on time and hints used."""
@@ -567,6 +834,12 @@ class JigsawPuzzle:
             return 0
 
         time_taken = time.time() - self.level_start_time
+
+        # The score moves at most once a second, so reuse it within the second
+        key = (self.level_start_time, int(time_taken), self.current_level, self.hints_used)
+        if self._score_cache is not None and self._score_cache[0] == key:
+            return self._score_cache[1]
+
         base_score = self.levels[self.current_level].points
 
         # Time bonus (faster = more points)
@@ -576,6 +849,7 @@ class JigsawPuzzle:
         hint_penalty = self.hints_used * 20
 
         final_score = max(50, base_score + time_bonus - hint_penalty)
+        self._score_cache = (key, final_score)
         return final_score
 
     def complete_level(self):
@@ -583,6 +857,7 @@ class JigsawPuzzle:
         level_score = self.calculate_level_score()
         self.total_score += level_score
         self.puzzle_complete = True
+        self._ui_dirty = True
         self.save_progress()
 
         print(f"Level {self.current_level + 1} completed!")
@@ -603,34 +878,68 @@ class JigsawPuzzle:
         self.last_hint_time = None
         self.hints_used = 0
 
-        if os.path.exists(self.save_file):
-            try:
-                with open(self.save_file, 'r') as f:
-                    data = json.load(f)
-                    if 'last_hint_time' in data:
-                        self.last_hint_time = datetime.fromisoformat(data['last_hint_time'])
-                    self.hints_used = data.get('hints_used', 0)
-                    self.current_level = data.get('current_level', 0)
-                    self.total_score = data.get('total_score', 0)
-            except:
-                pass
+        # One line: last_hint_time|hints_used|current_level|total_score,
+        # with an empty timestamp when no hint has been used yet. Every field
+        # is parsed before any is assigned, so a truncated or hand-edited line
+        # falls back to the JSON save instead of half-loading
+        try:
+            with open(self.save_file, 'r') as f:
+                fields = f.readline().rstrip('\n').split('|')
+            if len(fields) != 4:
+                raise ValueError(f"expected 4 fields, got {len(fields)}")
+            last_hint_time = datetime.fromisoformat(fields[0]) if fields[0] else None
+            hints_used = int(fields[1])
+            current_level = int(fields[2])
+            total_score = int(fields[3])
+        except (OSError, ValueError, IndexError):
+            pass
+        else:
+            self.last_hint_time = last_hint_time
+            self.hints_used = hints_used
+            self.current_level = current_level
+            self.total_score = total_score
+            return
+
+        # Fall back to the old JSON save
+        try:
+            with open(self.legacy_save_file, 'r') as f:
+                data = json.load(f)
+            last_hint_time = data.get('last_hint_time')
+            last_hint_time = datetime.fromisoformat(last_hint_time) if last_hint_time else None
+            hints_used = int(data.get('hints_used', 0))
+            current_level = int(data.get('current_level', 0))
+            total_score = int(data.get('total_score', 0))
+        except Exception:
+            return
+
+        self.last_hint_time = last_hint_time
+        self.hints_used = hints_used
+        self.current_level = current_level
+        self.total_score = total_score
 
     def save_progress(self):
         """Save game progress to file."""
-        data = {
-            'hints_used': self.hints_used,
-            'current_level': self.current_level,
-            'total_score': self.total_score
-        }
-        if self.last_hint_time:
-            data['last_hint_time'] = self.last_hint_time.isoformat()
+        last_hint_time = self.last_hint_time.isoformat() if self.last_hint_time else ''
+        line = f"{last_hint_time}|{self.hints_used}|{self.current_level}|{self.total_score}\n"
 
+        # Write to a temporary file and swap it in so a crash never leaves a
+        # truncated save behind
+        tmp_file = self.save_file + '.tmp'
         try:
-            with open(self.save_file, 'w') as f:
-                json.dump(data, f)
+            with open(tmp_file, 'w') as f:
+                f.write(line)
+            os.replace(tmp_file, self.save_file)
         except Exception as e:
             print(f"Could not save progress: {e}")
 
+        self._progress_dirty = False
+        self._next_save_time = time.monotonic() + PROGRESS_SAVE_INTERVAL_S
+
+    def flush_progress(self, force=False):
+        """Save pending progress if the save interval has passed, or now if forced."""
+        if self._progress_dirty and (force or time.monotonic() >= self._next_save_time):
+            self.save_progress()
+
     def can_use_hint(self):
         """Check if hint can be used (every 2 hours for better gameplay)."""
         if self.last_hint_time is None:
@@ -639,27 +948,55 @@ class JigsawPuzzle:
         time_since_last_hint = datetime.now() - self.last_hint_time
         return time_since_last_hint >= timedelta(hours=2)  # Reduced from 4
 
+    def refresh_hint_cache(self):
+        """Recompute hint availability and the timer text, at most once a second."""
+        tick = pygame.time.get_ticks() // 1000
+        if tick == self._hint_cache_tick:
+            return
+        self._hint_cache_tick = tick
+
+        self._hint_available = self.can_use_hint()
+        self._hint_timer_str = None
+        if not self._hint_available and self.last_hint_time:
+            time_left = timedelta(hours=2) - (datetime.now() - self.last_hint_time)
+            hours = int(time_left.total_seconds() // 3600)
+            minutes = int((time_left.total_seconds() % 3600) // 60)
+            self._hint_timer_str = f"Next hint: {hours}h {minutes}m"
+
     def use_hint(self):
         """Use a hint to reveal a piece's correct position."""
         if not self.can_use_hint():
             return False
 
-        # Find pieces that haven't been revealed as hints yet
-        unrevealed_pieces = [p for p in self.pieces if not p.hint_revealed and not p.is_placed]
-
-        if unrevealed_pieces:
-            # Reveal a random piece
-            piece = random.choice(unrevealed_pieces)
+        # Pick a random piece that hasn't been revealed as a hint yet, in one
+        # pass without building a candidate list (reservoir sampling)
+        piece = None
+        candidates = 0
+        for p in self.pieces:
+            if p.hint_revealed or p.is_placed:
+                continue
+            candidates += 1
+            if self._rng.random() * candidates < 1:
+                piece = p
+
+        if piece is not None:
+            # Reveal it
             piece.hint_revealed = True
+            self._active_hint_count += 1
+            self._hint_overlay = None
             self.hints_used += 1
+            self._ui_dirty = True
             self.last_hint_time = datetime.now()
-            self.save_progress()
+            self._hint_cache_tick = -1
+            self._frame_dirty = True
+            self._progress_dirty = True  # saved from the main loop
             return True
 
         return False
 
     def handle_mouse_down(self, pos):
         """Handle mouse button down events."""
+        self._frame_dirty = True
         # Check if clicking on UI buttons first
         if self.puzzle_complete and self.next_button_rect.collidepoint(pos):
             if self.current_level < len(self.levels) - 1:
@@ -678,31 +1015,40 @@ class JigsawPuzzle:
             return
 
         # Check if clicking on a piece
-        for piece in reversed(self.pieces):  # Check from top to bottom
-            if piece.contains_point(pos[0], pos[1]) and not piece.is_placed:
-                self.selected_piece = piece
-                piece.dragging = True
-                self.mouse_offset_x = pos[0] - piece.x
-                self.mouse_offset_y = pos[1] - piece.y
-                # Move selected piece to end of list (draw on top)
-                self.pieces.remove(piece)
-                self.pieces.append(piece)
-                break
+        piece = self.piece_at(pos)
+        if piece:
+            self.selected_piece = piece
+            piece.dragging = True
+            self.mouse_offset_x = pos[0] - piece.x
+            self.mouse_offset_y = pos[1] - piece.y
+            # Draw the selected piece on top; self.pieces keeps its order
+            piece.z_order = self._z_counter
+            self._z_counter += 1
+            self._draw_order.sort(key=attrgetter('z_order'))
+            self.sync_hit_index(piece)
 
     def handle_mouse_up(self, pos):
         """Handle mouse button up events."""
+        self._frame_dirty = True
         if self.selected_piece:
             # Check if piece is near its correct position
             if self.selected_piece.is_near_correct_position():
                 self.selected_piece.x = self.selected_piece.correct_x
                 self.selected_piece.y = self.selected_piece.correct_y
                 self.selected_piece.is_placed = True
+                self._placed_count += 1
+                self._ui_dirty = True
+                if self.selected_piece.hint_revealed:
+                    self._active_hint_count -= 1
+                    self._hint_overlay = None
+                    self._board_dirty = True  # clear its hint overlay
 
                 # Check if puzzle is complete
-                if all(piece.is_placed for piece in self.pieces):
+                if self._placed_count == self._total_pieces:
                     self.complete_level()
 
             self.selected_piece.dragging = False
+            self.sync_hit_index(self.selected_piece)
             self.selected_piece = None
 
     def handle_mouse_motion(self, pos):
@@ -710,186 +1056,268 @@ class JigsawPuzzle:
         if self.selected_piece and self.selected_piece.dragging:
             self.selected_piece.x = pos[0] - self.mouse_offset_x
             self.selected_piece.y = pos[1] - self.mouse_offset_y
+            self._frame_dirty = True
 
     def draw_hint_overlay(self):
         """Draw hint overlay showing where hinted pieces belong."""
-        overlay = pygame.Surface((self.puzzle_width, self.puzzle_height))
-        overlay.set_alpha(120)
-        overlay.fill((0, 0, 0))
-
-        for piece in self.pieces:
-            if piece.hint_revealed and not piece.is_placed:
-                # Draw the piece in its correct position with transparency
-                piece_x = piece.correct_x - self.puzzle_x
-                piece_y = piece.correct_y - self.puzzle_y
-                overlay.blit(piece.image_section, (piece_x, piece_y))
-
-                # Draw a pulsing yellow highlight
-                pulse = int(50 + 30 * math.sin(time.time() * 5))
-                highlight_color = (255, 255, pulse)
-                highlight_rect = pygame.Rect(piece_x - 3, piece_y - 3,
-                                        piece.width + 6, piece.height + 6)
-                pygame.draw.rect(overlay, highlight_color, highlight_rect, 4)
-
-        if any(piece.hint_revealed and not piece.is_placed for piece in self.pieces):
-            self.screen.blit(overlay, (self.puzzle_x, self.puzzle_y))
+        if not self._active_hint_count:
+            return
+
+        # The hinted pieces only change when a hint is used or a hinted piece
+        # is placed, so the overlay is composed once per change
+        if self._hint_overlay is None:
+            overlay = pygame.Surface((self.puzzle_width, self.puzzle_height)).convert()
+            overlay.set_alpha(120)
+            overlay.fill((0, 0, 0))
+            self._hint_rings = []
+            for piece in self.pieces:
+                if piece.hint_revealed and not piece.is_placed:
+                    # Draw the piece in its correct position with transparency
+                    piece_x = piece.correct_x - self.puzzle_x
+                    piece_y = piece.correct_y - self.puzzle_y
+                    overlay.blit(piece.image_section, (piece_x, piece_y))
+                    self._hint_rings.append(pygame.Rect(piece_x - 3, piece_y - 3,
+                                                        piece.width + 6, piece.height + 6))
+            self._hint_overlay = overlay
+
+        # Draw a pulsing yellow highlight; each ring repaints the same pixels
+        # every frame, so only its color changes
+        pulse = int(50 + 30 * math.sin(time.time() * 5))
+        highlight_color = (255, 255, pulse)
+        for highlight_rect in self._hint_rings:
+            pygame.draw.rect(self._hint_overlay, highlight_color, highlight_rect, 4)
+
+        self.background.blit(self._hint_overlay, (self.puzzle_x, self.puzzle_y))
+
+    def draw_board(self):
+        """Paint the puzzle area and hint overlay onto the cached background."""
+        pygame.draw.rect(self.background, (80, 80, 100), self.board_rect)
+        pygame.draw.rect(self.background, (120, 120, 140),
+                        (self.puzzle_x, self.puzzle_y, self.puzzle_width, self.puzzle_height))
+
+        # Draw hint overlay first (behind pieces)
+        self.draw_hint_overlay()
+        self.repaint(self.board_rect)
+
+    def render_text(self, slot, font, text, color):
+        """Render text for a UI slot, reusing the last surface if the text is unchanged."""
+        cached = self._text_slots.get(slot)
+        if cached is not None and cached[0] == text:
+            return cached[1]
+        text_surface = font.render(text, True, color)
+        self._text_slots[slot] = (text, text_surface)
+        return text_surface
+
+    def render_static_text(self, font, text, color):
+        """Render one of the game's fixed strings, rasterizing each only once."""
+        key = (font, text, color)
+        text_surface = self._text_cache.get(key)
+        if text_surface is None:
+            text_surface = self._text_cache[key] = font.render(text, True, color)
+        return text_surface
 
     def draw_ui(self):
-        """Draw the user interface."""
-        # Title and level info
-        level_info = f"Level {self.current_level + 1}: {self.levels[self.current_level].name}"
-        title = self.font.render(level_info, True, (255, 255, 255))
-        self.screen.blit(title, (50, 20))
+        """Draw the user interface onto the UI layer when what it shows changes."""
+        # Game events set _ui_dirty; the level score and hint timer move with
+        # the clock, so they are sampled at most once a second
+        second = pygame.time.get_ticks() // 1000
+        if self._ui_dirty or second != self._ui_second:
+            self._ui_second = second
+            self.refresh_hint_cache()
+            current_score = self.calculate_level_score() if self.level_start_time else None
+            clock_state = (current_score, self._hint_available, self._hint_timer_str)
+            if clock_state != self._ui_clock_state:
+                self._ui_clock_state = clock_state
+                self._ui_dirty = True
+
+        if not self._ui_dirty:
+            return
+        self._ui_dirty = False
+        current_score, hint_available, timer_text = self._ui_clock_state
+
+        surface = self.ui_layer.image
+        surface.fill((0, 0, 0, 0))
+        self.ui_layer.dirty = 1
 
-        # Level description
-        desc = self.levels[self.current_level].description
-        desc_surface = self.small_font.render(desc, True, (200, 200, 200))
-        self.screen.blit(desc_surface, (50, 50))
+        # Title, level description and difficulty stars
+        surface.blit(self._title_surf, (50, 20))
+        surface.blit(self._desc_surf, (50, 50))
+        surface.blit(self._stars_surf, (300, 70))
 
         # Progress
-        placed_pieces = sum(1 for piece in self.pieces if piece.is_placed)
-        total_pieces = len(self.pieces)
-        progress_text = f"Progress: {placed_pieces}/{total_pieces} pieces"
-        progress_surface = self.small_font.render(progress_text, True, (255, 255, 255))
-        self.screen.blit(progress_surface, (50, 75))
+        progress_text = f"Progress: {self._placed_count}/{self._total_pieces} pieces"
+        progress_surface = self.render_text("progress", self.small_font, progress_text, (255, 255, 255))
+        surface.blit(progress_surface, (50, 75))
 
         # Score
         score_text = f"Total Score: {self.total_score}"
-        score_surface = self.small_font.render(score_text, True, (255, 215, 0))
-        self.screen.blit(score_surface, (300, 20))
+        score_surface = self.render_text("score", self.small_font, score_text, (255, 215, 0))
+        surface.blit(score_surface, (300, 20))
 
-        if self.level_start_time:
-            current_score = self.calculate_level_score()
+        if current_score is not None:
             level_score_text = f"Level Score: {current_score}"
-            level_score_surface = self.small_font.render(level_score_text, True, (255, 215, 0))
-            self.screen.blit(level_score_surface, (300, 45))
-
-        # Difficulty stars
-        difficulty = self.levels[self.current_level].difficulty
-        stars_text = "★" * difficulty + "☆" * (5 - difficulty)
-        stars_surface = self.small_font.render(f"Difficulty: {stars_text}", True, (255, 255, 100))
-        self.screen.blit(stars_surface, (300, 70))
+            level_score_surface = self.render_text("level_score", self.small_font,
+                                                   level_score_text, (255, 215, 0))
+            surface.blit(level_score_surface, (300, 45))
 
         # Hint button
-        hint_color = (0, 200, 0) if self.can_use_hint() else (100, 100, 100)
-        pygame.draw.rect(self.screen, hint_color, self.hint_button_rect)
-        pygame.draw.rect(self.screen, (255, 255, 255), self.hint_button_rect, 2)
+        hint_color = (0, 200, 0) if hint_available else (100, 100, 100)
+        pygame.draw.rect(surface, hint_color, self.hint_button_rect)
+        pygame.draw.rect(surface, (255, 255, 255), self.hint_button_rect, 2)
 
-        hint_text = "HINT" if self.can_use_hint() else "WAIT"
-        hint_surface = self.small_font.render(hint_text, True, (255, 255, 255))
+        hint_text = "HINT" if hint_available else "WAIT"
+        hint_surface = self.render_static_text(self.small_font, hint_text, (255, 255, 255))
         hint_rect = hint_surface.get_rect(center=self.hint_button_rect.center)
-        self.screen.blit(hint_surface, hint_rect)
+        surface.blit(hint_surface, hint_rect)
 
         # Hint timer
-        if not self.can_use_hint() and self.last_hint_time:
-            time_left = timedelta(hours=2) - (datetime.now() - self.last_hint_time)
-            hours = int(time_left.total_seconds() // 3600)
-            minutes = int((time_left.total_seconds() % 3600) // 60)
-            timer_text = f"Next hint: {hours}h {minutes}m"
-            timer_surface = self.small_font.render(timer_text, True, (255, 255, 100))
-            self.screen.blit(timer_surface, (900, 500))
+        if timer_text:
+            timer_surface = self.render_text("timer", self.small_font, timer_text, (255, 255, 100))
+            surface.blit(timer_surface, (900, 500))
 
         # Hints used
         hints_text = f"Hints used: {self.hints_used}"
-        hints_surface = self.small_font.render(hints_text, True, (255, 255, 255))
-        self.screen.blit(hints_surface, (900, 475))
+        hints_surface = self.render_text("hints_used", self.small_font, hints_text, (255, 255, 255))
+        surface.blit(hints_surface, (900, 475))
 
         # Next level button (only when puzzle is complete)
         if self.puzzle_complete:
             button_color = (0, 150, 0)
-            pygame.draw.rect(self.screen, button_color, self.next_button_rect)
-            pygame.draw.rect(self.screen, (255, 255, 255), self.next_button_rect, 2)
+            pygame.draw.rect(surface, button_color, self.next_button_rect)
+            pygame.draw.rect(surface, (255, 255, 255), self.next_button_rect, 2)
 
             button_text = "NEXT LEVEL" if self.current_level < len(self.levels) - 1 else "RESTART"
-            next_surface = self.small_font.render(button_text, True, (255, 255, 255))
+            next_surface = self.render_static_text(self.small_font, button_text, (255, 255, 255))
             next_rect = next_surface.get_rect(center=self.next_button_rect.center)
-            self.screen.blit(next_surface, next_rect)
+            surface.blit(next_surface, next_rect)
 
         # Instructions
-        instructions = [
-            "Drag pieces to assemble the puzzle",
-            "Click HINT button for help (every 2 hours)",
-            "Green border = correctly placed",
-            "Yellow border = hinted piece",
-            "Red border = currently dragging"
-        ]
-
-        for i, instruction in enumerate(instructions):
-            text_surface = self.small_font.render(instruction, True, (180, 180, 180))
-            self.screen.blit(text_surface, (50, 600 + i * 20))
+        surface.blits(self._instruction_surfaces, doreturn=False)
 
         # Level progression indicator
-        progress_y = 750
+        surface.blit(self._progress_surface, (50, 750))
+
+        # Win message
+        if self.puzzle_complete:
+            self.draw_win_message(surface)
+
+    def build_progress_surface(self):
+        """Render the level progression indicator for the current level."""
         level_width = 600 // len(self.levels)
+        self._progress_surface = pygame.Surface((level_width * len(self.levels), 20),
+                                                pygame.SRCALPHA).convert_alpha()
         for i, level in enumerate(self.levels):
-            x = 50 + i * level_width
+            x = i * level_width
             color = (0, 255, 0) if i < self.current_level else (100, 100, 100)
             if i == self.current_level:
                 color = (255, 255, 0)
 
-            pygame.draw.rect(self.screen, color, (x, progress_y, level_width - 2, 20))
+            pygame.draw.rect(self._progress_surface, color, (x, 0, level_width - 2, 20))
 
             # Level number
             if level_width > 30:
-                level_text = str(i + 1)
-                level_surface = self.small_font.render(level_text, True, (0, 0, 0))
-                level_rect = level_surface.get_rect(center=(x + level_width // 2, progress_y + 10))
-                self.screen.blit(level_surface, level_rect)
+                level_surface = self._digit_surfs[i]
+                level_rect = level_surface.get_rect(center=(x + level_width // 2, 10))
+                self._progress_surface.blit(level_surface, level_rect)
+
+    def draw_win_message(self, surface):
+        """Draw the level-complete banner onto surface."""
+        if self.current_level >= len(self.levels) - 1:
+            win_text = "🎉 ALL LEVELS COMPLETE! 🎉"
+            color = (255, 215, 0)  # Gold
+        else:
+            win_text = "🎉 LEVEL COMPLETE! 🎉"
+            color = (0, 255, 0)  # Green
+
+        win_surface = self.render_static_text(self.large_font, win_text, color)
+        win_rect = win_surface.get_rect(center=(self.screen_width // 2, 400))
+
+        # Draw background for text
+        bg_rect = win_rect.inflate(40, 20)
+        surface.fill((0, 0, 0, 180), bg_rect)
+        pygame.draw.rect(surface, color, bg_rect, 3)
+
+        surface.blit(win_surface, win_rect)
+
+        # Show level score
+        if hasattr(self, 'level_start_time') and self.level_start_time:
+            level_score = self.calculate_level_score()
+            score_text = f"Level Score: +{level_score} points!"
+            score_surface = self.render_text("win_score", self.font, score_text, (255, 255, 255))
+            score_rect = score_surface.get_rect(center=(self.screen_width // 2, 440))
+            surface.blit(score_surface, score_rect)
 
     def draw(self):
-        """Main drawing function."""
-        self.screen.fill((40, 40, 60))  # Dark blue background
-
-        # Draw puzzle area background
-        pygame.draw.rect(self.screen, (80, 80, 100),
-                        (self.puzzle_x - 5, self.puzzle_y - 5,
-                        self.puzzle_width + 10, self.puzzle_height + 10))
-        pygame.draw.rect(self.screen, (120, 120, 140),
-                        (self.puzzle_x, self.puzzle_y, self.puzzle_width, self.puzzle_height))
-
-        # Draw hint overlay first (behind pieces)
-        self.draw_hint_overlay()
-
-        # Draw pieces
-        for piece in self.pieces:
-            if piece.hint_revealed and not piece.is_placed:
-                piece.draw(self.screen, alpha=220)  # Slightly transparent for hints
-            else:
-                piece.draw(self.screen)
+        """Redraw the parts of the screen that changed; returns the dirty rects."""
+        # Repaint the board after a hint changes, and every frame while a
+        # hint highlight is pulsing
+        if self._board_dirty or self._active_hint_count:
+            self.draw_board()
+            self._board_dirty = False
 
         # Draw UI
         self.draw_ui()
 
-        # Win message
-        if self.puzzle_complete:
-            if self.current_level >= len(self.levels) - 1:
-                win_text = "🎉 ALL LEVELS COMPLETE! 🎉"
-                color = (255, 215, 0)  # Gold
-            else:
-                win_text = "🎉 LEVEL COMPLETE! 🎉"
-                color = (0, 255, 0)  # Green
-
-            win_surface = self.large_font.render(win_text, True, color)
-            win_rect = win_surface.get_rect(center=(self.screen_width // 2, 400))
-
-            # Draw background for text
-            bg_rect = win_rect.inflate(40, 20)
-            # Create a surface for transparency
-            bg_surface = pygame.Surface((bg_rect.width, bg_rect.height))
-            bg_surface.set_alpha(180)
-            bg_surface.fill((0, 0, 0))
-            self.screen.blit(bg_surface, bg_rect)
-            pygame.draw.rect(self.screen, color, bg_rect, 3)
-
-            self.screen.blit(win_surface, win_rect)
-
-            # Show level score
-            if hasattr(self, 'level_start_time') and self.level_start_time:
-                level_score = self.calculate_level_score()
-                score_text = f"Level Score: +{level_score} points!"
-                score_surface = self.font.render(score_text, True, (255, 255, 255))
-                score_rect = score_surface.get_rect(center=(self.screen_width // 2, 440))
-                self.screen.blit(score_surface, score_rect)
+        return self.draw_sprites()
+
+    def needs_redraw(self):
+        """Check whether the next frame can differ from the one on screen."""
+        # Pulsing hints animate every frame, and the level score and hint
+        # timer are sampled once a second
+        return (self._frame_dirty or self._active_hint_count > 0
+                or pygame.time.get_ticks() // 1000 != self._ui_second)
+
+    def request_full_present(self):
+        """Flip the whole retained screen on the next frame, even if idle."""
+        self._full_redraw = True
+        self._frame_dirty = True
+
+    def present(self, rects):
+        """Push the frame to the display, updating only the changed rects.
+
+        Dirty-rect updates assume the window still shows the last frame; after
+        a level load or any of FULL_PRESENT_EVENTS the whole screen is flipped.
+        """
+        if self._full_redraw:
+            self._full_redraw = False
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+
+    def repaint(self, rect):
+        """Queue a screen area to be redrawn on the next frame."""
+        self._repaint_rects.append(pygame.Rect(rect))
+
+    def draw_sprites(self):
+        """Redraw the dirty areas of the screen; returns the rects that changed."""
+        sprites = self._draw_order + [self.ui_layer]
+        rects = self._repaint_rects
+        self._repaint_rects = []
+
+        # A dirty sprite needs both its old and its new area redrawn
+        for sprite in sprites:
+            if sprite.dirty:
+                old_rect = self._drawn_rects.get(sprite)
+                if old_rect is not None:
+                    rects.append(old_rect)
+                rects.append(sprite.rect.copy())
+                self._drawn_rects[sprite] = sprite.rect.copy()
+                sprite.dirty = 0
+        if not rects:
+            return []
+
+        # Merged rects keep translucent sprites from being blended twice
+        dirty = merge_rects(rects)
+
+        # Background first, then every sprite clipped to the dirty areas in
+        # draw order (piece bodies followed by their borders), all in a
+        # single blits call
+        blit_sequence = [(self.background, rect, rect) for rect in dirty]
+        for sprite in sprites:
+            for index in sprite.rect.collidelistall(dirty):
+                blit_sequence.extend(sprite.get_blit_tuples(sprite.rect.clip(dirty[index])))
+        self.screen.blits(blit_sequence, doreturn=False)
+        return dirty
 
     def run(self):
         """Main game loop."""
@@ -911,6 +1339,9 @@ class JigsawPuzzle:
                 elif event.type == pygame.MOUSEMOTION:
                     self.handle_mouse_motion(event.pos)
 
+                elif event.type in FULL_PRESENT_EVENTS:
+                    self.request_full_present()
+
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_h:  # Hint key
                         if self.use_hint():
@@ -924,10 +1355,14 @@ class JigsawPuzzle:
                             self.current_level = 0
                             self.load_level(self.current_level)
 
-            self.draw()
-            pygame.display.flip()
+            # Idle frames with nothing to change skip drawing entirely
+            if self.needs_redraw():
+                self.present(self.draw())
+                self._frame_dirty = False
+            self.flush_progress()
             self.clock.tick(60)
 
+        self.flush_progress(force=True)
         pygame.quit()
 
 
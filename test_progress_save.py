@@ -0,0 +1,93 @@
+"""
+Unit tests for saving and loading game progress.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from jigsaw_puzzle import JigsawPuzzle
+
+class TestProgressSave(unittest.TestCase):
+
+    def setUp(self):
+        """Run each test in an empty directory so no real save is touched."""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp_dir.name)
+        self.game = JigsawPuzzle()
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        self.tmp_dir.cleanup()
+        pygame.quit()
+
+    def write_legacy_save(self):
+        """Write an old-style JSON save next to the new one."""
+        with open(self.game.legacy_save_file, 'w') as f:
+            json.dump({'hints_used': 2, 'current_level': 3, 'total_score': 1861,
+                       'last_hint_time': '2025-09-13T05:23:31.064717'}, f)
+
+    def test_round_trip(self):
+        """Test that every saved field loads back unchanged."""
+        hint_time = datetime(2026, 1, 2, 3, 4, 5, 678901)
+        self.game.current_level = 4
+        self.game.total_score = 1234
+        self.game.hints_used = 3
+        self.game.last_hint_time = hint_time
+        self.game.save_progress()
+
+        self.assertFalse(os.path.exists(self.game.save_file + '.tmp'))
+
+        loaded = JigsawPuzzle()
+        self.assertEqual(loaded.current_level, 4)
+        self.assertEqual(loaded.total_score, 1234)
+        self.assertEqual(loaded.hints_used, 3)
+        self.assertEqual(loaded.last_hint_time, hint_time)
+
+    def test_round_trip_without_hint(self):
+        """Test that a save made before any hint loads with no hint time."""
+        self.game.current_level = 1
+        self.game.total_score = 100
+        self.game.last_hint_time = None
+        self.game.save_progress()
+
+        loaded = JigsawPuzzle()
+        self.assertEqual(loaded.current_level, 1)
+        self.assertEqual(loaded.total_score, 100)
+        self.assertIsNone(loaded.last_hint_time)
+
+    def test_legacy_json_save(self):
+        """Test that the old JSON save is read when there is no new save."""
+        self.write_legacy_save()
+
+        self.game.load_progress()
+        self.assertEqual(self.game.current_level, 3)
+        self.assertEqual(self.game.total_score, 1861)
+        self.assertEqual(self.game.hints_used, 2)
+        self.assertEqual(self.game.last_hint_time, datetime(2025, 9, 13, 5, 23, 31, 64717))
+
+    def test_malformed_line_falls_back_to_json(self):
+        """Test that a truncated or edited save line never half-loads."""
+        self.write_legacy_save()
+
+        for line in ["2026-01-02T03:04:05|1|2", "2026-01-02T03:04:05|1|two|50",
+                     "not a date|1|2|50", ""]:
+            with open(self.game.save_file, 'w') as f:
+                f.write(line + "\n")
+
+            self.game.load_progress()
+            self.assertEqual(self.game.current_level, 3, line)
+            self.assertEqual(self.game.total_score, 1861, line)
+            self.assertEqual(self.game.hints_used, 2, line)
+            self.assertEqual(self.game.last_hint_time,
+                             datetime(2025, 9, 13, 5, 23, 31, 64717), line)
+
+if __name__ == '__main__':
+    unittest.main()